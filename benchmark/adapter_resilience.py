@@ -0,0 +1,153 @@
+"""
+Check of the rate limiting and retries of the PhantomBuster adapters.
+
+Runs the adapters against the local PhantomBuster stand-in, with scripted 429 / 5xx responses and rate-limit
+headers, and exits with a non-zero status if any scenario does not behave as expected:
+
+- a 429 holds back every request sharing the limiter for `Retry-After`, and slows the limiter down;
+- an exhausted `X-RateLimit-Remaining` holds back the next request until `X-RateLimit-Reset`;
+- 5xx responses are retried with jittered backoff until one succeeds;
+- the retries give up after `max_retries`, returning the failed response (or raising on connection errors).
+
+No database is needed.
+
+Usage:
+    python -m benchmark.adapter_resilience
+"""
+import asyncio
+import sys
+from typing import Awaitable, Callable
+
+import aiohttp
+from aiohttp import web
+
+from benchmark.fake_phantombuster import API_PREFIX, FakePhantomBusterConfig, FakePhantomBusterServer, free_port
+from src.infrastructure.external.http.ratelimit import TokenBucketRateLimiter
+from src.infrastructure.external.http.retry import RetryPolicy
+from src.infrastructure.external.phantombuster.adapter import PhantomBusterAgentAdapter, PhantomBusterContainerAdapter
+
+RETRY_AFTER = 0.5
+# Timers and the loop scheduling are not exact.
+TOLERANCE = 0.05
+
+
+def gaps(times: list[float]) -> list[float]:
+    return [later - earlier for earlier, later in zip(times, times[1:])]
+
+
+async def retry_after(server: FakePhantomBusterServer, base_url: str) -> list[str]:
+    limiter = TokenBucketRateLimiter(rate=100)
+    policy = RetryPolicy(max_retries=3, backoff_base=0.01, backoff_max=0.05)
+    agent_adapter = PhantomBusterAgentAdapter("key", base_url, rate_limiter=limiter, retry_policy=policy)
+    container_adapter = PhantomBusterContainerAdapter("key", base_url, rate_limiter=limiter, retry_policy=policy)
+    server.script((429, {"Retry-After": str(RETRY_AFTER)}))
+
+    throttled = asyncio.create_task(agent_adapter.list_agents())
+    while not server.request_times:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+    # Sent while the limiter is blocked by the 429: it has to wait as well, although its adapter got no 429.
+    other = await container_adapter.list_containers(agent_id="bench-agent-0")
+    response = await throttled
+
+    errors = []
+    if not response.ok or not other.ok:
+        errors.append(f"expected both requests to succeed, got {response.status_code} and {other.status_code}")
+    if len(server.request_times) != 3:
+        errors.append(f"expected 3 requests (429, retry, other), got {len(server.request_times)}")
+    first, *later = server.request_times
+    if later and min(later) - first < RETRY_AFTER - TOLERANCE:
+        errors.append(f"a request was sent {min(later) - first:.3f}s after the 429, before Retry-After")
+    if limiter.rate >= limiter.max_rate:
+        errors.append(f"expected the limiter to slow down after the 429, its rate is {limiter.rate}")
+    return errors
+
+
+async def rate_limit_headers(server: FakePhantomBusterServer, base_url: str) -> list[str]:
+    limiter = TokenBucketRateLimiter(rate=100)
+    adapter = PhantomBusterAgentAdapter("key", base_url, rate_limiter=limiter)
+    server.script((200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(RETRY_AFTER)}))
+
+    first = await adapter.list_agents()
+    second = await adapter.list_agents()
+
+    errors = []
+    if not first.ok or not second.ok:
+        errors.append(f"expected both requests to succeed, got {first.status_code} and {second.status_code}")
+    elif gaps(server.request_times)[0] < RETRY_AFTER - TOLERANCE:
+        errors.append(f"the next request was sent {gaps(server.request_times)[0]:.3f}s after the quota ran out, "
+                      f"before X-RateLimit-Reset")
+    return errors
+
+
+async def retries_5xx(server: FakePhantomBusterServer, base_url: str) -> list[str]:
+    policy = RetryPolicy(max_retries=3, backoff_base=0.05, backoff_max=1)
+    adapter = PhantomBusterAgentAdapter("key", base_url, retry_policy=policy)
+    server.script((500, {}), (503, {}), (502, {}))
+
+    response = await adapter.list_agents()
+
+    errors = []
+    if not response.ok:
+        errors.append(f"expected the 4th attempt to succeed, got {response.status_code}")
+    if len(server.request_times) != 4:
+        errors.append(f"expected 4 requests, got {len(server.request_times)}")
+    # Full jitter: the delay before the retry following attempt n is drawn from [0, base * 2 ** n].
+    for attempt, gap in enumerate(gaps(server.request_times)):
+        if gap > policy.backoff_base * 2 ** attempt + TOLERANCE:
+            errors.append(f"retry #{attempt + 1} waited {gap:.3f}s, more than its backoff bound")
+    return errors
+
+
+async def gives_up(server: FakePhantomBusterServer, base_url: str) -> list[str]:
+    policy = RetryPolicy(max_retries=2, backoff_base=0.01, backoff_max=0.05)
+    adapter = PhantomBusterAgentAdapter("key", base_url, retry_policy=policy)
+    server.script(*[(500, {})] * 5)
+
+    response = await adapter.list_agents()
+
+    errors = []
+    if response.ok or response.status_code != 500:
+        errors.append(f"expected the failed response to be returned, got {response.status_code}")
+    if len(server.request_times) != 3:
+        errors.append(f"expected 3 requests (1 + max_retries), got {len(server.request_times)}")
+
+    unreachable = PhantomBusterAgentAdapter("key", f"http://127.0.0.1:{free_port()}{API_PREFIX}", retry_policy=policy)
+    try:
+        await unreachable.list_agents()
+        errors.append("expected the connection error to be raised after the retries")
+    except aiohttp.ClientError:
+        pass
+    return errors
+
+
+SCENARIOS: dict[str, Callable[[FakePhantomBusterServer, str], Awaitable[list[str]]]] = {
+    "429 honours Retry-After": retry_after,
+    "exhausted quota honours X-RateLimit-Reset": rate_limit_headers,
+    "5xx are retried with backoff": retries_5xx,
+    "retries give up after max_retries": gives_up,
+}
+
+
+async def check() -> list[str]:
+    failures = []
+    for name, scenario in SCENARIOS.items():
+        server = FakePhantomBusterServer(FakePhantomBusterConfig(agents=2, containers_per_agent=2, rows_per_container=1))
+        runner = web.AppRunner(server.app())
+        await runner.setup()
+        port = free_port()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        try:
+            errors = await scenario(server, f"http://127.0.0.1:{port}{API_PREFIX}")
+        finally:
+            await runner.cleanup()
+        print(f"{'FAILED' if errors else 'ok':<8}{name}")
+        for error in errors:
+            print(f"        {error}")
+        if errors:
+            failures.append(name)
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if asyncio.run(check()) else 0)
@@ -0,0 +1,99 @@
+"""
+Parity check and benchmark of the vectorized text metrics of `CustomFromDFAnalyticsReportProvider`.
+
+Computes the report of synthetic posts with the provider and with the previous row-by-row implementation
+(kept below as the reference), prints both timings, and exits with a non-zero status if any report differs.
+No database is needed.
+
+Usage:
+    python -m benchmark.analytics_metrics --sizes 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import datetime
+import random
+import sys
+import time
+
+import emoji
+import pandas as pd
+
+from src.domain.entity import Activity
+from src.domain.entity.analytics.model import AnalyticsReport
+from src.infrastructure.provider.analytics import CustomFromDFAnalyticsReportProvider
+
+EMOJIS = list(emoji.EMOJI_DATA)
+WORDS = [
+    "growth", "marketing", "#hiring", "#ai", "team", "launch", "ok", "\n", "\n\n", "—", "’", "…", "𝐁𝐨𝐥𝐝", "中文",
+    "‍", "️", "1️⃣", "👨‍💻", "🇫🇷", "👍🏽",
+]
+
+
+def make_activities(size: int, seed: int = 0) -> list[Activity]:
+    rnd = random.Random(seed)
+    base = datetime.datetime(2024, 6, 1)
+    return [
+        Activity.model_construct(
+            post_content=" ".join(
+                rnd.choice(EMOJIS) if rnd.random() < 0.1 else rnd.choice(WORDS) for _ in range(rnd.randint(0, 60))
+            ),
+            post_timestamp=base - datetime.timedelta(hours=rnd.randint(0, 24 * 365 * 3)),
+            like_count=rnd.randint(0, 5000),
+            comment_count=rnd.randint(0, 500),
+            img_url="https://media.licdn.com/image.jpg" if index % 3 == 0 else None,
+            video_url="https://media.licdn.com/video.mp4" if index % 7 == 0 else None,
+        )
+        for index in range(size)
+    ]
+
+
+def reference_report(activities: list[Activity]) -> AnalyticsReport:
+    """
+    The row-by-row implementation the provider had before it was vectorized.
+    """
+    df = pd.DataFrame([activity.model_dump() for activity in activities])
+    return AnalyticsReport(
+        start_date=activities[0].post_timestamp,
+        end_date=activities[-1].post_timestamp,
+        average_text_length=df["post_content"].apply(len).mean(),
+        average_postings_per_month=df["post_timestamp"].dt.to_period("M").value_counts().mean(),
+        average_headline_length=0,
+        average_emojis=df["post_content"].apply(lambda x: emoji.emoji_count(x)).mean(),
+        average_likes=df["like_count"].mean(),
+        average_comments=df["comment_count"].mean(),
+        average_paragraphs=df["post_content"].apply(lambda x: x.count("\n")).mean(),
+        average_hashtags=df["post_content"].apply(lambda x: x.count("#")).mean(),
+        percentage_visuals_used=(df["img_url"].notnull() | df["video_url"].notnull()).sum() / df.shape[0],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare and time the pandas analytics report implementations.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    provider = CustomFromDFAnalyticsReportProvider()
+    failures = []
+    print(f"{'posts':>10}{'reference s':>14}{'vectorized s':>14}{'speedup':>10}  parity")
+    for size in args.sizes:
+        activities = make_activities(size)
+
+        started_at = time.perf_counter()
+        expected = reference_report(activities)
+        reference_elapsed = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        actual = asyncio.run(provider.generate_report(activities))
+        vectorized_elapsed = time.perf_counter() - started_at
+
+        differing = [field for field, value in expected.model_dump().items() if getattr(actual, field) != value]
+        print(f"{size:>10}{reference_elapsed:>14.2f}{vectorized_elapsed:>14.2f}"
+              f"{reference_elapsed / vectorized_elapsed:>9.1f}x  {', '.join(differing) or 'ok'}")
+        if differing:
+            failures.append(size)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
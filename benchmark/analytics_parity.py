@@ -0,0 +1,122 @@
+"""
+Parity check of the analytics report providers.
+
+Writes a synthetic profile to the Postgres database configured in `src/.env` (migrated to head), computes its
+report with the pandas provider (from the activities in memory), with the SQL-aggregate provider and from the
+monthly rollups maintained by the ingest (from the database), deletes the profile afterwards, and exits with
+a non-zero status if the reports differ.
+
+Usage:
+    python -m benchmark.analytics_parity --size 10000
+"""
+import argparse
+import asyncio
+import datetime
+import random
+import sys
+
+from sqlalchemy import delete
+
+from src.config.settings import settings
+from src.domain.entity import Activity, ActivityFilter
+from src.infrastructure.db.postgres.orm import activity as activity_orm
+from src.infrastructure.db.postgres.orm import analytics_rollup as rollup_orm
+from src.infrastructure.db.postgres.orm import profile as profile_orm
+from src.infrastructure.db.postgres.session import DatabaseSessionManager
+from src.infrastructure.provider.analytics import (
+    CustomFromDFAnalyticsReportProvider,
+    PostgresAggregateAnalyticsReportProvider,
+)
+from src.infrastructure.repository.activity.postgres import ActivityRepository
+
+AGENT_ID = "bench-analytics"
+PROFILE_URL = f"https://www.linkedin.com/in/{AGENT_ID}"
+# Both reports are rounded to 2 decimals, from float (pandas) and numeric (Postgres) averages.
+TOLERANCE = 0.011
+
+WORDS = ["growth", "marketing", "#hiring", "#ai", "team", "launch", "🚀", "👍🏽", "🇫🇷", "👨‍👩‍👧", "ok", "\n", "\n\n"]
+
+
+def make_activities(size: int, seed: int = 0) -> list[Activity]:
+    rnd = random.Random(seed)
+    base = datetime.datetime(2024, 6, 1)
+    return [
+        Activity.model_construct(
+            post_url=f"https://www.linkedin.com/feed/update/urn:li:activity:{index}",
+            type="Text",
+            video_url="https://media.licdn.com/video.mp4" if index % 7 == 0 else None,
+            img_url="https://media.licdn.com/image.jpg" if index % 3 == 0 else None,
+            post_content=" ".join(rnd.choices(WORDS, k=rnd.randint(0, 60))),
+            like_count=rnd.randint(0, 5000),
+            comment_count=rnd.randint(0, 500),
+            repost_count=rnd.randint(0, 100),
+            post_date="1w",
+            action="Post",
+            profile_url=PROFILE_URL,
+            timestamp=base,
+            post_timestamp=base - datetime.timedelta(hours=rnd.randint(0, 24 * 365)),
+            agent_id=AGENT_ID,
+            container_id=str(2_000_000 + index // 1000),
+        )
+        for index in range(size)
+    ]
+
+
+async def cleanup(manager: DatabaseSessionManager) -> None:
+    async with manager.session() as session:
+        await session.execute(delete(activity_orm.Activity).where(activity_orm.Activity.agent_id == AGENT_ID))
+        await session.execute(delete(profile_orm.Profile).where(profile_orm.Profile.profile_url == PROFILE_URL))
+        await session.execute(delete(rollup_orm.AnalyticsMonthlyRollup).where(
+            rollup_orm.AnalyticsMonthlyRollup.profile_url == PROFILE_URL))
+
+
+async def compare(size: int) -> list[str]:
+    activities = make_activities(size)
+    manager = DatabaseSessionManager(
+        host=str(settings.pg_dsn).replace("postgresql", "postgresql+asyncpg"),
+        engine_kwargs={},
+        session_maker_kwargs={'autoflush': True, 'expire_on_commit': False, 'future': True}
+    )
+    reports = {}
+    try:
+        async with ActivityRepository(session_manager=manager) as repo:
+            await repo.bulk_create(activities)
+
+        # The pandas provider takes the start / end dates from the first / last activity.
+        activities.sort(key=lambda activity: activity.post_timestamp)
+        async with CustomFromDFAnalyticsReportProvider() as provider:
+            reports["pandas"] = await provider.generate_report(activities)
+        for name, use_rollups in (("sql", False), ("rollups", True)):
+            async with PostgresAggregateAnalyticsReportProvider(session_manager=manager,
+                                                                use_rollups=use_rollups) as provider:
+                reports[name] = await provider.query_report(ActivityFilter(profile_url=PROFILE_URL))
+    finally:
+        await cleanup(manager)
+        await manager.close()
+
+    mismatches = []
+    for field, value in reports["pandas"].model_dump().items():
+        others = [getattr(reports[name], field) for name in ("sql", "rollups")]
+        same = all(abs(value - other) <= TOLERANCE if isinstance(value, float) else value == other
+                   for other in others)
+        columns = "".join(f"{str(column):>28}" for column in (value, *others))
+        print(f"{'ok' if same else 'MISMATCH':<10}{field:<28}{columns}")
+        if not same:
+            mismatches.append(field)
+    return mismatches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the pandas, SQL-aggregate and rollup analytics reports.")
+    parser.add_argument("--size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'':<10}{'field':<28}{'pandas':>28}{'sql':>28}{'rollups':>28}")
+    mismatches = asyncio.run(compare(args.size))
+    if mismatches:
+        print(f"\n{len(mismatches)} field(s) differ: {', '.join(mismatches)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
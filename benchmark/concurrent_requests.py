@@ -0,0 +1,173 @@
+"""
+Concurrency check of the request-scoped sessions.
+
+Writes a few synthetic profiles to the Postgres database configured in `src/.env` (migrated to head), fires
+parallel `/activity/` and `/analytics/` requests for all of them through the application (in process, over ASGI),
+deletes the profiles afterwards, and exits with a non-zero status if:
+
+- a session was used by more than one request (the repositories and providers are shared by the requests);
+- a response does not hold exactly the activities / the report of the profile it asked for.
+
+Usage:
+    python -m benchmark.concurrent_requests --profiles 8 --rounds 5
+"""
+import argparse
+import asyncio
+import collections
+import datetime
+import re
+import sys
+
+import httpx
+from sqlalchemy import delete, event
+from sqlalchemy.orm import Session
+
+from src.app import FastAPIWebApplication
+from src.domain.entity import Activity
+from src.infrastructure.db.postgres.orm import activity as activity_orm
+from src.infrastructure.db.postgres.orm import analytics_rollup as rollup_orm
+from src.infrastructure.db.postgres.orm import profile as profile_orm
+from src.infrastructure.repository.activity.postgres import ActivityRepository
+
+AGENT_ID = "bench-concurrency"
+PROFILE_URL_PREFIX = f"https://www.linkedin.com/in/{AGENT_ID}-"
+# Position of the average likes among the cells of the analytics report row.
+AVERAGE_LIKES_CELL = 6
+CELL = re.compile(r"<td>(.*?)</td>", re.S)
+
+
+def profile_url(index: int) -> str:
+    return f"{PROFILE_URL_PREFIX}{index}"
+
+
+def make_activities(profiles: int) -> list[Activity]:
+    """
+    Profile #i has 5 * (i + 1) activities, all posted the same month and liked 10 * (i + 1) times,
+    so every response tells which profile it was computed from.
+    """
+    base = datetime.datetime(2024, 6, 1)
+    return [
+        Activity.model_construct(
+            post_url=f"https://www.linkedin.com/feed/update/urn:li:activity:{AGENT_ID}-{index}-{rank}",
+            type="Text",
+            video_url=None,
+            img_url=None,
+            post_content=f"post {rank} of profile {index}",
+            like_count=10 * (index + 1),
+            comment_count=0,
+            repost_count=0,
+            post_date="1w",
+            action="Post",
+            profile_url=profile_url(index),
+            timestamp=base,
+            post_timestamp=base + datetime.timedelta(hours=rank),
+            agent_id=AGENT_ID,
+            container_id=str(3_000_000 + index),
+        )
+        for index in range(profiles)
+        for rank in range(5 * (index + 1))
+    ]
+
+
+async def cleanup(application: FastAPIWebApplication) -> None:
+    async with application.pg_session_manager.session() as session:
+        await session.execute(delete(activity_orm.Activity).where(activity_orm.Activity.agent_id == AGENT_ID))
+        await session.execute(delete(profile_orm.Profile).where(
+            profile_orm.Profile.profile_url.startswith(PROFILE_URL_PREFIX)))
+        await session.execute(delete(rollup_orm.AnalyticsMonthlyRollup).where(
+            rollup_orm.AnalyticsMonthlyRollup.profile_url.startswith(PROFILE_URL_PREFIX)))
+
+
+def check_activities(index: int, body: str) -> str | None:
+    listed = [cell for cell in CELL.findall(body) if cell.startswith(PROFILE_URL_PREFIX)]
+    expected = [profile_url(index)] * 5 * (index + 1)
+    if listed != expected:
+        return (f"/activity/ of profile {index}: expected {len(expected)} of its activities, "
+                f"got {dict(collections.Counter(listed))}")
+    return None
+
+
+def check_report(index: int, body: str) -> str | None:
+    cells = CELL.findall(body)
+    if len(cells) <= AVERAGE_LIKES_CELL or float(cells[AVERAGE_LIKES_CELL]) != 10 * (index + 1):
+        return f"/analytics/ of profile {index}: expected an average of {10 * (index + 1)} likes, got {cells}"
+    return None
+
+
+async def request(client: httpx.AsyncClient, name: str, url: str, index: int, checker) -> str | None:
+    """
+    Send a request from its own task, named after it, and check its response.
+    """
+    asyncio.current_task().set_name(name)
+    response = await client.get(url, params={"profile_url": profile_url(index)})
+    if response.status_code != 200:
+        return f"{name}: status {response.status_code}"
+    return checker(index, response.text)
+
+
+async def fire(app, profiles: int, rounds: int, session_tasks: dict[int, set[str]]) -> list[str]:
+    """
+    Fire all the requests at once, and check their responses and the sessions they used.
+    """
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://concurrency") as client:
+        tasks = [
+            asyncio.create_task(request(client, f"{kind}-{round_}-{index}", f"/{kind}/", index, checker))
+            for round_ in range(rounds)
+            for index in range(profiles)
+            for kind, checker in (("activity", check_activities), ("analytics", check_report))
+        ]
+        errors = list(filter(None, await asyncio.gather(*tasks)))
+
+    shared = [names for names in session_tasks.values() if len(names) > 1]
+    for names in shared:
+        errors.append(f"a session was used by several requests: {', '.join(sorted(names))}")
+    served = set().union(*session_tasks.values())
+    print(f"{len(tasks)} concurrent requests, {len(session_tasks)} sessions, {len(shared)} shared by several requests")
+    if len(served) < len(tasks):
+        errors.append(f"{len(tasks) - len(served)} requests executed no statement through a session")
+    return errors
+
+
+async def check(profiles: int, rounds: int) -> list[str]:
+    application = FastAPIWebApplication()
+    app = application.asgi
+
+    # The tasks (hence the requests) every session executed statements for.
+    session_tasks: dict[int, set[str]] = collections.defaultdict(set)
+
+    def record(orm_execute_state) -> None:
+        session_tasks[id(orm_execute_state.session)].add(asyncio.current_task().get_name())
+
+    event.listen(Session, "do_orm_execute", record)
+    errors = []
+    try:
+        async with app.router.lifespan_context(app):
+            await cleanup(application)
+            try:
+                async with ActivityRepository(session_manager=application.pg_session_manager) as repo:
+                    await repo.bulk_create(make_activities(profiles))
+                    await repo.commit()
+                session_tasks.clear()
+                errors.extend(await fire(app, profiles, rounds, session_tasks))
+            finally:
+                await cleanup(application)
+    finally:
+        event.remove(Session, "do_orm_execute", record)
+    return errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fire concurrent /activity/ and /analytics/ requests.")
+    parser.add_argument("--profiles", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    errors = asyncio.run(check(args.profiles, args.rounds))
+    for error in errors:
+        print(error)
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+This module contains a local stand-in for the PhantomBuster API, used to benchmark the sync.
+
+It implements the `agents/fetch-all`, `containers/fetch-all` and `containers/fetch-result-object`
+endpoints with configurable volumes, latency and error rates. The generated data is deterministic,
+so the same configuration always serves the same agents, containers and posts. Checks can also script
+the status and headers of the next responses (see `FakePhantomBusterServer.script`).
+
+Run it standalone with:
+    python -m benchmark.fake_phantombuster --agents 10 --containers 20 --rows 100 --latency 0.05
+"""
+import argparse
+import asyncio
+import collections
+import datetime
+import json
+import random
+import socket
+import time
+
+from aiohttp import web
+from pydantic import BaseModel, Field
+
+API_PREFIX = "/api/v2/"
+AGENT_ID_PREFIX = "bench-agent-"
+
+
+class FakePhantomBusterConfig(BaseModel):
+    """
+    Configuration of the fake PhantomBuster server.
+    """
+
+    agents: int = Field(10, ge=0)
+    containers_per_agent: int = Field(20, ge=0)
+    rows_per_container: int = Field(100, ge=0)
+    content_length: int = Field(400, ge=0)
+    latency: float = Field(0.0, ge=0)
+    latency_jitter: float = Field(0.0, ge=0)
+    error_rate: float = Field(0.0, ge=0, le=1)
+    throttle_rate: float = Field(0.0, ge=0, le=1)
+    retry_after: float = Field(1.0, ge=0)
+    seed: int = 0
+
+
+class FakePhantomBusterServer:
+    """
+    aiohttp application serving the fake PhantomBuster API.
+    """
+
+    def __init__(self, config: FakePhantomBusterConfig):
+        self.config = config
+        self.stats = {"requests": 0, "errors": 0, "throttled": 0, "rows_served": 0}
+        self.request_times: list[float] = []
+        self._scripted: collections.deque[tuple[int, dict[str, str]]] = collections.deque()
+        self._random = random.Random(config.seed)
+
+    def script(self, *responses: tuple[int, dict[str, str]]) -> None:
+        """
+        Answer the next API requests with the given statuses and headers, in order, before going back to
+        the configured behaviour. A scripted success is served the regular response, with the headers added.
+        """
+        self._scripted.extend(responses)
+
+    def agent_ids(self) -> list[str]:
+        return [f"{AGENT_ID_PREFIX}{index}" for index in range(self.config.agents)]
+
+    def container_ids(self, agent_id: str) -> list[str]:
+        agent_index = int(agent_id.removeprefix(AGENT_ID_PREFIX))
+        first = (agent_index + 1) * 1_000_000
+        return [str(first + index) for index in range(self.config.containers_per_agent)]
+
+    def result_rows(self, container_id: str) -> list[dict]:
+        rnd = random.Random(f"{self.config.seed}-{container_id}")
+        base = datetime.datetime(2024, 1, 1) + datetime.timedelta(minutes=int(container_id) % 500_000)
+        rows = []
+        for index in range(self.config.rows_per_container):
+            posted_at = base - datetime.timedelta(hours=rnd.randint(0, 24 * 365))
+            words = " ".join(rnd.choice(("lorem", "ipsum", "dolor", "#growth", "🚀", "sit\n", "amet"))
+                             for _ in range(max(self.config.content_length // 6, 1)))
+            visual = rnd.random()
+            rows.append({
+                "postUrl": f"https://www.linkedin.com/feed/update/urn:li:activity:{container_id}{index:06d}",
+                "type": rnd.choice(("Text", "Image", "Video", "Article")),
+                "imgUrl": "https://media.licdn.com/image.jpg" if visual < 0.3 else None,
+                "videoUrl": "https://media.licdn.com/video.mp4" if 0.3 <= visual < 0.4 else None,
+                "postContent": words[:self.config.content_length],
+                "likeCount": rnd.randint(0, 5000),
+                "commentCount": rnd.randint(0, 500),
+                "repostCount": rnd.randint(0, 100),
+                "postDate": "1w",
+                "action": rnd.choice(("Post", "Repost", "Comment")),
+                "profileUrl": f"https://www.linkedin.com/in/profile-{rnd.randint(0, 50)}",
+                "timestamp": base.isoformat() + "Z",
+                "postTimestamp": posted_at.isoformat() + "Z",
+            })
+        return rows
+
+    async def _simulate(self, request: web.Request) -> web.Response | None:
+        """
+        Apply the configured latency and return an error response if this request should fail.
+        """
+        self.stats["requests"] += 1
+        delay = self.config.latency + self._random.uniform(0, self.config.latency_jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        roll = self._random.random()
+        if roll < self.config.throttle_rate:
+            self.stats["throttled"] += 1
+            return web.json_response({"error": "Too many requests"}, status=429,
+                                     headers={"Retry-After": str(self.config.retry_after)})
+        if roll < self.config.throttle_rate + self.config.error_rate:
+            self.stats["errors"] += 1
+            return web.json_response({"error": "Internal server error"}, status=500)
+        return None
+
+    async def fetch_all_agents(self, request: web.Request) -> web.Response:
+        if (error := await self._simulate(request)) is not None:
+            return error
+        return web.json_response([{"id": agent_id, "name": agent_id} for agent_id in self.agent_ids()])
+
+    async def fetch_all_containers(self, request: web.Request) -> web.Response:
+        if (error := await self._simulate(request)) is not None:
+            return error
+        agent_id = request.query.get("agentId", "")
+        if not agent_id.startswith(AGENT_ID_PREFIX):
+            return web.json_response({"error": "Agent not found"}, status=404)
+        containers = [
+            {"id": container_id, "status": "finished", "agentId": agent_id}
+            for container_id in self.container_ids(agent_id)
+        ]
+        return web.json_response({"containers": containers})
+
+    async def fetch_result_object(self, request: web.Request) -> web.Response:
+        if (error := await self._simulate(request)) is not None:
+            return error
+        container_id = request.query.get("id", "")
+        if not container_id.isdigit():
+            return web.json_response({"error": "Container not found"}, status=404)
+        rows = self.result_rows(container_id)
+        self.stats["rows_served"] += len(rows)
+        return web.json_response({"id": container_id, "resultObject": json.dumps(rows)})
+
+    async def get_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats)
+
+    @web.middleware
+    async def _record(self, request: web.Request, handler) -> web.StreamResponse:
+        """
+        Record when every API request arrives, and answer it as scripted, if it is.
+        """
+        if not request.path.startswith(API_PREFIX):
+            return await handler(request)
+        self.request_times.append(time.monotonic())
+        if not self._scripted:
+            return await handler(request)
+        status, headers = self._scripted.popleft()
+        if status >= 400:
+            self.stats["requests"] += 1
+            self.stats["throttled" if status == 429 else "errors"] += 1
+            return web.json_response({"error": "Scripted failure"}, status=status, headers=headers)
+        response = await handler(request)
+        response.headers.update(headers)
+        return response
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._record])
+        for path, handler in (
+                ("agents/fetch-all", self.fetch_all_agents),
+                ("containers/fetch-all", self.fetch_all_containers),
+                ("containers/fetch-result-object", self.fetch_result_object),
+        ):
+            app.router.add_get(f"{API_PREFIX}{path}", handler)
+            app.router.add_get(f"{API_PREFIX}{path}/", handler)
+        app.router.add_get("/__stats", self.get_stats)
+        return app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run(config: FakePhantomBusterConfig, host: str = "127.0.0.1", port: int = 8081) -> None:
+    web.run_app(FakePhantomBusterServer(config).app(), host=host, port=port, print=None)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--agents", type=int, default=10)
+    parser.add_argument("--containers", type=int, default=20, help="Containers per agent.")
+    parser.add_argument("--rows", type=int, default=100, help="Rows per container result.")
+    parser.add_argument("--content-length", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.0, help="Base latency per request in seconds.")
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500.")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429.")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def config_from_arguments(args: argparse.Namespace) -> FakePhantomBusterConfig:
+    return FakePhantomBusterConfig(
+        agents=args.agents,
+        containers_per_agent=args.containers,
+        rows_per_container=args.rows,
+        content_length=args.content_length,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the PhantomBuster API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    add_arguments(parser)
+    args = parser.parse_args()
+    run(config_from_arguments(args), host=args.host, port=args.port)
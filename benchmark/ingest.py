@@ -0,0 +1,110 @@
+"""
+Benchmark of the `ActivityRepository.bulk_create` ingest modes (COPY, multi-row INSERT, ORM).
+
+Every (mode, size) case runs in a fresh process, so the reported peak RSS belongs to that case only.
+The rows are written to the Postgres database configured in `src/.env` and deleted afterwards.
+
+Usage:
+    python -m benchmark.ingest --sizes 10000 100000 1000000 --modes copy insert orm
+"""
+import argparse
+import asyncio
+import datetime
+import multiprocessing
+import resource
+import time
+
+from sqlalchemy import delete
+
+from src.config.settings import settings
+from src.domain.entity import Activity
+from src.infrastructure.db.postgres.orm import activity as activity_orm
+from src.infrastructure.db.postgres.orm import analytics_rollup as rollup_orm
+from src.infrastructure.db.postgres.orm import profile as profile_orm
+from src.infrastructure.db.postgres.session import DatabaseSessionManager
+from src.infrastructure.repository.activity.postgres import ActivityRepository
+
+AGENT_ID = "bench-ingest"
+PROFILE_URL_PREFIX = f"https://www.linkedin.com/in/{AGENT_ID}-"
+
+
+def make_activities(size: int) -> list[Activity]:
+    base = datetime.datetime(2024, 1, 1)
+    return [
+        Activity.model_construct(
+            post_url=f"https://www.linkedin.com/feed/update/urn:li:activity:{index}",
+            type="Text",
+            video_url=None,
+            img_url="https://media.licdn.com/image.jpg" if index % 3 == 0 else None,
+            post_content="lorem ipsum dolor sit amet #growth 🚀\n" * 8,
+            like_count=index % 5000,
+            comment_count=index % 500,
+            repost_count=index % 100,
+            post_date="1w",
+            action="Post",
+            profile_url=f"{PROFILE_URL_PREFIX}{index % 50}",
+            timestamp=base,
+            post_timestamp=base - datetime.timedelta(minutes=index),
+            agent_id=AGENT_ID,
+            container_id=str(1_000_000 + index // 1000),
+        )
+        for index in range(size)
+    ]
+
+
+def session_manager() -> DatabaseSessionManager:
+    return DatabaseSessionManager(
+        host=str(settings.pg_dsn).replace("postgresql", "postgresql+asyncpg"),
+        engine_kwargs={},
+        session_maker_kwargs={'autoflush': True, 'expire_on_commit': False, 'future': True}
+    )
+
+
+async def cleanup() -> None:
+    manager = session_manager()
+    async with manager.session() as session:
+        await session.execute(delete(activity_orm.Activity).where(activity_orm.Activity.agent_id == AGENT_ID))
+        await session.execute(
+            delete(profile_orm.Profile).where(profile_orm.Profile.profile_url.startswith(PROFILE_URL_PREFIX)))
+        await session.execute(delete(rollup_orm.AnalyticsMonthlyRollup).where(
+            rollup_orm.AnalyticsMonthlyRollup.profile_url.startswith(PROFILE_URL_PREFIX)))
+    await manager.close()
+
+
+async def ingest(mode: str, size: int) -> float:
+    activities = make_activities(size)
+    manager = session_manager()
+    try:
+        started_at = time.perf_counter()
+        async with ActivityRepository(session_manager=manager, ingest_mode=mode) as repo:
+            await repo.bulk_create(activities)
+        return time.perf_counter() - started_at
+    finally:
+        await manager.close()
+
+
+def run_case(mode: str, size: int, results: multiprocessing.Queue) -> None:
+    elapsed = asyncio.run(ingest(mode, size))
+    results.put((elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the activity bulk ingest modes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--modes", nargs="+", choices=["copy", "insert", "orm"], default=["copy", "insert", "orm"])
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'rows':>10}{'seconds':>10}{'rows/s':>12}{'peak RSS MiB':>14}")
+    for size in args.sizes:
+        for mode in args.modes:
+            results = multiprocessing.Queue()
+            process = multiprocessing.Process(target=run_case, args=(mode, size, results))
+            process.start()
+            elapsed, peak_rss_mb = results.get()
+            process.join()
+            asyncio.run(cleanup())
+            print(f"{mode:<8}{size:>10}{elapsed:>10.2f}{size / elapsed:>12.0f}{peak_rss_mb:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Plan-regression check of the activity queries.
+
+Runs `EXPLAIN` on the statements generated by the repository and the provider against the Postgres
+database configured in `src/.env` (migrated to head), with sequential scans discouraged, and exits
+with a non-zero status if any of them scans the activities table (or any of its monthly partitions)
+sequentially, or does not look up the index expected to serve it with an `Index Cond`.
+
+Discouraging sequential scans makes the planner fall back to any index path, including a full scan of
+an index that ignores the predicate, so an index used without `Index Cond` does not count: the predicate
+has to be looked up in the expected index (or in its partitions).
+
+Usage:
+    python -m benchmark.query_plans
+"""
+import asyncio
+import datetime
+import json
+import sys
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import Select
+
+from src.config.settings import settings
+from src.domain.entity import ActivityFilter
+from src.infrastructure.db.postgres.orm import activity as activity_orm
+from src.infrastructure.db.postgres.partition import PARTITION_SUFFIX
+from src.infrastructure.db.postgres.session import DatabaseSessionManager
+from src.infrastructure.provider.activity import PhantomBusterWithPGActivityProvider
+from src.infrastructure.repository.activity.postgres import ActivityRepository, encode_cursor
+
+
+def statements() -> dict[str, tuple[Select, str | None]]:
+    """
+    The statements on the hot paths, keyed by a readable name, with the activity index expected to serve them
+    (None for the statements that do not read the activities).
+    """
+    return {
+        "repository.list(profile_url)": (
+            ActivityRepository._list_statement(ActivityFilter(profile_url="https://www.linkedin.com/in/someone")),
+            "ix_activities_profile_url_post_timestamp"),
+        "repository.list(profile_url, post_timestamp range)": (
+            ActivityRepository._list_statement(
+                ActivityFilter(profile_url="https://www.linkedin.com/in/someone",
+                               post_timestamp_from=datetime.datetime(2024, 1, 1),
+                               post_timestamp_to=datetime.datetime(2024, 2, 1))),
+            "ix_activities_profile_url_post_timestamp"),
+        "repository.list(agent_id, container_id)": (
+            ActivityRepository._list_statement(ActivityFilter(agentId="1", containerId="2")),
+            "ix_activities_agent_id_container_id"),
+        "repository.list_page(cursor)": (
+            ActivityRepository._page_statement(
+                ActivityFilter(), limit=100, cursor=encode_cursor(datetime.datetime(2024, 1, 1), 1000)),
+            "ix_activities_post_timestamp_id"),
+        "repository.list_page(profile_url, cursor)": (
+            ActivityRepository._page_statement(
+                ActivityFilter(profile_url="https://www.linkedin.com/in/someone"), limit=100,
+                cursor=encode_cursor(datetime.datetime(2024, 1, 1), 1000)),
+            "ix_activities_profile_url_post_timestamp"),
+        "repository.list_page(search)": (
+            ActivityRepository._page_statement(ActivityFilter(), limit=100, search="growth marketing"),
+            "ix_activities_post_content_tsv"),
+        "repository.list_profiles()": (ActivityRepository._profiles_statement(), None),
+        "provider._get_stored_container_ids()": (
+            PhantomBusterWithPGActivityProvider._stored_container_ids_statement(["1", "2", "3"]),
+            "uq_activities_container_id_post_url_action"),
+    }
+
+
+def seq_scanned_tables(plan: dict) -> list[str]:
+    tables = []
+    if plan.get("Node Type") == "Seq Scan":
+        tables.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        tables.extend(seq_scanned_tables(child))
+    return tables
+
+
+def index_lookups(plan: dict) -> list[str]:
+    """
+    The indexes the plan looks up with an `Index Cond` (index, index only and bitmap index scans).
+    """
+    indexes = []
+    if plan.get("Index Name") and plan.get("Index Cond"):
+        indexes.append(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        indexes.extend(index_lookups(child))
+    return indexes
+
+
+async def root_index(connection, index: str) -> str:
+    """
+    The index of the partitioned table a partition index is attached to, or the index itself.
+    """
+    result = await connection.execute(
+        text("SELECT coalesce(pg_partition_root(CAST(CAST(:index AS text) AS regclass))::text, :index)"),
+        {"index": index}
+    )
+    return result.scalar()
+
+
+def is_activity_table(table: str | None) -> bool:
+    name = activity_orm.Activity.__tablename__
+    return table is not None and (table == name or table.startswith(f"{name}{PARTITION_SUFFIX}"))
+
+
+async def check() -> list[str]:
+    session_manager = DatabaseSessionManager(
+        host=str(settings.pg_dsn).replace("postgresql", "postgresql+asyncpg"),
+        engine_kwargs={},
+        session_maker_kwargs={}
+    )
+    failures = []
+    try:
+        async with session_manager.connect() as connection:
+            # The tables of a test database are tiny, so a sequential scan would win on cost alone.
+            # With it discouraged, the planner only picks one when no index can serve the query;
+            # whether the index it picks really serves the predicate is checked from the Index Cond.
+            await connection.execute(text("SET LOCAL enable_seqscan = off"))
+            for name, (statement, expected_index) in statements().items():
+                sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+                result = await connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+                plan = result.scalar()
+                plan = json.loads(plan) if isinstance(plan, str) else plan
+                tables = seq_scanned_tables(plan[0]["Plan"])
+                indexes = {await root_index(connection, index) for index in index_lookups(plan[0]["Plan"])}
+                if any(map(is_activity_table, tables)):
+                    status = "SEQ SCAN"
+                elif expected_index is not None and expected_index not in indexes:
+                    status = "NO INDEX"
+                else:
+                    status = "ok"
+                detail = f" (expected {expected_index}, looked up: {', '.join(sorted(indexes)) or 'none'})"
+                print(f"{status:<9}{name}{detail if status == 'NO INDEX' else ''}")
+                if status != "ok":
+                    failures.append(name)
+            await connection.rollback()
+    finally:
+        await session_manager.close()
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if asyncio.run(check()) else 0)
@@ -0,0 +1,177 @@
+"""
+Check of the read-replica routing of the activity repository.
+
+Points a `DatabaseSessionManager` at the primary configured in `src/.env` and at the reader of
+`POSTGRES_READER_HOSTS` (both migrated to head; two independent local instances are enough, e.g. the `database`
+and `database-reader` services of ops/docker/docker-compose.yml), runs read-only repository calls, and exits with
+a non-zero status if any scenario does not route as expected:
+
+- the reads are spread round-robin over the readers;
+- a failing reader is marked down, the read fails over to the primary, and the next scopes skip that reader
+  until `reader_retry_interval` has passed;
+- with every reader down, the reads go to the primary;
+- the analytics reports are computed on the readers as well.
+
+A failing reader is simulated by a DSN nobody listens on.
+
+Usage:
+    POSTGRES_READER_HOSTS=localhost:5433 python -m benchmark.read_replicas
+"""
+import asyncio
+import sys
+from typing import Awaitable, Callable
+
+from pydantic import PostgresDsn
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from benchmark.fake_phantombuster import free_port
+from src.config.settings import settings
+from src.domain.entity import ActivityFilter
+from src.infrastructure.db.postgres.session import DatabaseSessionManager
+from src.infrastructure.provider.analytics import PostgresAggregateAnalyticsReportProvider
+from src.infrastructure.repository.activity.postgres import ActivityRepository
+
+RETRY_INTERVAL = 1.0
+PROFILE_URL = "https://www.linkedin.com/in/bench-replicas"
+
+
+def asyncpg_dsn(dsn) -> str:
+    return str(dsn).replace("postgresql", "postgresql+asyncpg")
+
+
+def unreachable_dsn() -> str:
+    return asyncpg_dsn(PostgresDsn.build(
+        scheme="postgresql",
+        username=settings.pg_user,
+        password=settings.pg_password,
+        host="127.0.0.1",
+        port=free_port(),
+        path=settings.pg_name or "",
+    ))
+
+
+def make_manager(reader_dsns: list[str]) -> DatabaseSessionManager:
+    return DatabaseSessionManager(
+        host=asyncpg_dsn(settings.pg_dsn),
+        engine_kwargs={},
+        session_maker_kwargs={'autoflush': True, 'expire_on_commit': False, 'future': True},
+        reader_hosts=reader_dsns,
+        reader_retry_interval=RETRY_INTERVAL
+    )
+
+
+def engine_names(manager: DatabaseSessionManager) -> dict:
+    names = {manager._engine.sync_engine: "primary"}
+    names |= {engine.sync_engine: f"reader #{index}" for index, engine in enumerate(manager._reader_engines)}
+    return names
+
+
+async def list_activities(manager: DatabaseSessionManager, scopes: int) -> None:
+    repository = ActivityRepository(session_manager=manager)
+    for _ in range(scopes):
+        async with repository as repo:
+            await repo.list(ActivityFilter(profile_url=PROFILE_URL), limit=1)
+
+
+async def query_reports(manager: DatabaseSessionManager, scopes: int) -> None:
+    # A single aggregate query per report: no rollups, no emoji stream.
+    provider = PostgresAggregateAnalyticsReportProvider(manager, count_emojis=False, use_rollups=False)
+    for _ in range(scopes):
+        async with provider as analytics:
+            try:
+                await analytics.query_report(ActivityFilter(profile_url=PROFILE_URL))
+            except ValueError:
+                pass  # No activities: the query was executed all the same.
+
+
+async def routed_reads(manager: DatabaseSessionManager, scopes: int,
+                       read: Callable[[DatabaseSessionManager, int], Awaitable[None]] = list_activities) -> list[str]:
+    """
+    Run `read` (a read-only repository call by default) in each of `scopes` successive scopes, and return where
+    the statements were executed (a read failing on a reader shows up on the reader, then on the primary
+    it failed over to).
+    """
+    names = engine_names(manager)
+    routes: list[str] = []
+
+    def record(orm_execute_state) -> None:
+        routes.append(names.get(orm_execute_state.session.get_bind(), "unknown"))
+
+    event.listen(Session, "do_orm_execute", record)
+    try:
+        await read(manager, scopes)
+    finally:
+        event.remove(Session, "do_orm_execute", record)
+    return routes
+
+
+def expect(routes: list[str], expected: list[str]) -> list[str]:
+    return [] if routes == expected else [f"expected the reads on {expected}, got {routes}"]
+
+
+async def round_robin(reader_dsn: str) -> list[str]:
+    manager = make_manager([reader_dsn, reader_dsn])
+    try:
+        return expect(await routed_reads(manager, 4), ["reader #0", "reader #1", "reader #0", "reader #1"])
+    finally:
+        await manager.close()
+
+
+async def failover(reader_dsn: str) -> list[str]:
+    manager = make_manager([unreachable_dsn(), reader_dsn])
+    try:
+        # Reader #0 fails: its read is retried on the primary, and reader #0 is skipped until it may be retried.
+        errors = expect(await routed_reads(manager, 3), ["reader #0", "primary", "reader #1", "reader #1"])
+        if 0 not in {index for index, reader in enumerate(manager.pool_stats()["readers"]) if reader["down"]}:
+            errors.append("expected reader #0 to be reported down in the pool stats")
+        await asyncio.sleep(RETRY_INTERVAL)
+        # Retried once the interval has passed: it fails again, so the read goes to the primary again.
+        errors += expect(await routed_reads(manager, 1), ["reader #0", "primary"])
+        return errors
+    finally:
+        await manager.close()
+
+
+async def all_readers_down(reader_dsn: str) -> list[str]:
+    manager = make_manager([unreachable_dsn()])
+    try:
+        return expect(await routed_reads(manager, 3), ["reader #0", "primary", "primary", "primary"])
+    finally:
+        await manager.close()
+
+
+async def analytics(reader_dsn: str) -> list[str]:
+    manager = make_manager([unreachable_dsn(), reader_dsn])
+    try:
+        return expect(await routed_reads(manager, 3, query_reports), ["reader #0", "primary", "reader #1", "reader #1"])
+    finally:
+        await manager.close()
+
+
+SCENARIOS: dict[str, Callable[[str], Awaitable[list[str]]]] = {
+    "reads are spread round-robin over the readers": round_robin,
+    "a failing reader fails over to the primary and is skipped": failover,
+    "with every reader down, the reads go to the primary": all_readers_down,
+    "the analytics reports are computed on the readers": analytics,
+}
+
+
+async def check() -> list[str]:
+    if not settings.pg_reader_dsns:
+        print("POSTGRES_READER_HOSTS is not set: there is no reader to route to.")
+        return ["configuration"]
+    reader_dsn = asyncpg_dsn(settings.pg_reader_dsns[0])
+    failures = []
+    for name, scenario in SCENARIOS.items():
+        errors = await scenario(reader_dsn)
+        print(f"{'FAILED' if errors else 'ok':<8}{name}")
+        for error in errors:
+            print(f"        {error}")
+        if errors:
+            failures.append(name)
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if asyncio.run(check()) else 0)
@@ -0,0 +1,84 @@
+"""
+Latency check of the event loop while analytics reports are computed.
+
+Computes the report of synthetic posts with `CustomFromDFAnalyticsReportProvider`, inline and in every kind
+of executor pool, while lightweight "requests" keep running on the event loop: each one sleeps `--interval`
+seconds, and how late it wakes up is how long a cheap request (e.g. the home page) would have been stalled.
+Exits with a non-zero status if a request is stalled for more than `--max-stall` seconds with the process pool.
+No database is needed.
+
+Usage:
+    python -m benchmark.report_latency --size 200000 --reports 2 --workers 2
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from benchmark.analytics_metrics import make_activities
+from src.domain.entity import Activity
+from src.infrastructure.provider.analytics import CustomFromDFAnalyticsReportProvider
+from src.infrastructure.runner.executor import ExecutorManager
+
+
+async def probe(interval: float, stop: asyncio.Event) -> list[float]:
+    """
+    Run lightweight requests one after another until stopped, and return how late each of them was served.
+    """
+    stalls = []
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        await asyncio.sleep(interval)
+        stalls.append(time.perf_counter() - started_at - interval)
+    return stalls
+
+
+async def measure(kind: str, activities: list[Activity], reports: int, workers: int,
+                  interval: float) -> tuple[float, list[float]]:
+    executor = None if kind == "none" else ExecutorManager(kind=kind, max_workers=workers)
+    provider = CustomFromDFAnalyticsReportProvider(executor=executor)
+    if executor is not None:
+        await executor.open()
+        # Start the workers up front, as the lifespan would have done long before the first report.
+        await asyncio.gather(*(executor.run(time.sleep, 0.1) for _ in range(workers)))
+    try:
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(interval, stop))
+        await asyncio.sleep(interval)
+        started_at = time.perf_counter()
+        await asyncio.gather(*(provider.generate_report(activities) for _ in range(reports)))
+        elapsed = time.perf_counter() - started_at
+        stop.set()
+        return elapsed, await prober
+    finally:
+        if executor is not None:
+            await executor.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure how much the analytics reports stall the event loop.")
+    parser.add_argument("--size", type=int, default=200_000, help="Number of posts per report.")
+    parser.add_argument("--reports", type=int, default=2, help="Number of concurrent reports.")
+    parser.add_argument("--workers", type=int, default=2, help="Size of the executor pools.")
+    parser.add_argument("--interval", type=float, default=0.005, help="Seconds between the lightweight requests.")
+    parser.add_argument("--max-stall", type=float, default=0.1,
+                        help="Longest stall of a lightweight request tolerated with the process pool.")
+    args = parser.parse_args()
+
+    activities = make_activities(args.size)
+    print(f"{'executor':>10}{'reports s':>12}{'requests':>10}{'p50 stall s':>13}{'p99 stall s':>13}{'max stall s':>13}")
+    failed = False
+    for kind in ("none", "thread", "process"):
+        elapsed, stalls = asyncio.run(measure(kind, activities, args.reports, args.workers, args.interval))
+        percentiles = statistics.quantiles(stalls, n=100, method="inclusive") if len(stalls) > 1 else [0.0] * 99
+        p50, p99 = percentiles[49], percentiles[98]
+        print(f"{kind:>10}{elapsed:>12.2f}{len(stalls):>10}{p50:>13.4f}{p99:>13.4f}{max(stalls, default=0):>13.4f}")
+        if kind == "process" and max(stalls, default=0) > args.max_stall:
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+End-to-end benchmark of `ActivityUseCase.sync` against the local PhantomBuster stand-in.
+
+The fake server runs in a separate process, so its CPU and memory do not skew the numbers.
+The activities are written to the Postgres database configured in `src/.env`.
+
+Usage:
+    python -m benchmark.sync --agents 20 --containers 50 --rows 200 --latency 0.05 --concurrency 16 --reset
+"""
+import argparse
+import asyncio
+import multiprocessing
+import resource
+import time
+
+import aiohttp
+from sqlalchemy import delete
+
+from benchmark.fake_phantombuster import (
+    AGENT_ID_PREFIX,
+    API_PREFIX,
+    add_arguments,
+    config_from_arguments,
+    free_port,
+    run,
+)
+from src.application.usecase.activity import ActivityUseCase
+from src.config.settings import settings
+from src.infrastructure.db.postgres.orm import activity as activity_orm
+from src.infrastructure.db.postgres.orm import sync_checkpoint as sync_checkpoint_orm
+from src.infrastructure.db.postgres.session import DatabaseSessionManager
+from src.infrastructure.external.http.ratelimit import TokenBucketRateLimiter
+from src.infrastructure.external.http.retry import RetryPolicy
+from src.infrastructure.external.http.session import HTTPSessionManager
+from src.infrastructure.external.phantombuster.adapter import PhantomBusterAgentAdapter, PhantomBusterContainerAdapter
+from src.infrastructure.provider.activity import PhantomBusterWithPGActivityProvider
+from src.infrastructure.repository.activity.postgres import ActivityRepository
+from src.infrastructure.runner.job import InProcessJobRunner
+
+
+async def wait_until_ready(url: str, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                async with session.get(url) as response:
+                    if response.ok:
+                        return
+            except aiohttp.ClientError:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"The fake PhantomBuster server did not start at {url}")
+            await asyncio.sleep(0.1)
+
+
+async def reset(session_manager: DatabaseSessionManager) -> None:
+    """
+    Remove the rows of the previous benchmark runs, so every container is synced again.
+    """
+    async with session_manager.session() as session:
+        await session.execute(
+            delete(activity_orm.Activity).where(activity_orm.Activity.agent_id.like(f"{AGENT_ID_PREFIX}%"))
+        )
+        await session.execute(
+            delete(sync_checkpoint_orm.SyncCheckpoint).where(
+                sync_checkpoint_orm.SyncCheckpoint.agent_id.like(f"{AGENT_ID_PREFIX}%"))
+        )
+
+
+async def benchmark(args: argparse.Namespace, server_url: str) -> None:
+    session_manager = DatabaseSessionManager(
+        host=str(settings.pg_dsn).replace("postgresql", "postgresql+asyncpg"),
+        engine_kwargs={},
+        session_maker_kwargs={'autoflush': True, 'expire_on_commit': False, 'future': True}
+    )
+    http_session_manager = HTTPSessionManager(
+        connector_kwargs={"limit": max(args.concurrency, 1) * 2, "ttl_dns_cache": 300},
+        timeout_kwargs={"total": 120}
+    )
+    rate_limiter = TokenBucketRateLimiter(rate=args.rate_limit, capacity=args.rate_limit)
+    retry_policy = RetryPolicy(max_retries=args.max_retries)
+    base_url = f"{server_url}{API_PREFIX}"
+    provider = PhantomBusterWithPGActivityProvider(
+        phantombuster_agent_adapter=PhantomBusterAgentAdapter(
+            "bench", base_url, http_session_manager, rate_limiter, retry_policy),
+        phantombuster_container_adapter=PhantomBusterContainerAdapter(
+            "bench", base_url, http_session_manager, rate_limiter, retry_policy),
+        session_manager=session_manager,
+        concurrency=args.concurrency
+    )
+    usecase = ActivityUseCase(
+        activity_repo=ActivityRepository(session_manager=session_manager),
+        activity_provider=provider,
+        job_runner=InProcessJobRunner(),
+        sync_batch_size=args.batch_size
+    )
+
+    if args.reset:
+        await reset(session_manager)
+
+    await http_session_manager.open()
+    try:
+        started_at = time.perf_counter()
+        rows = await usecase.sync()
+        wall_time = time.perf_counter() - started_at
+    finally:
+        await http_session_manager.close()
+        await session_manager.close()
+
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{server_url}/__stats") as response:
+            stats = await response.json()
+
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"wall time:       {wall_time:.2f}s")
+    print(f"requests:        {stats['requests']} ({stats['requests'] / wall_time:.1f} req/s, "
+          f"{stats['errors']} errors, {stats['throttled']} throttled)")
+    print(f"rows inserted:   {rows} ({rows / wall_time:.1f} rows/s)")
+    print(f"peak RSS:        {peak_rss_mb:.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the activity sync against a fake PhantomBuster API.")
+    add_arguments(parser)
+    parser.add_argument("--concurrency", type=int, default=settings.phantom_buster_sync_concurrency)
+    parser.add_argument("--batch-size", type=int, default=settings.sync_batch_size)
+    parser.add_argument("--rate-limit", type=float, default=10_000, help="Client-side requests per second.")
+    parser.add_argument("--max-retries", type=int, default=settings.phantom_buster_max_retries)
+    parser.add_argument("--reset", action="store_true", help="Delete the rows of the previous benchmark runs first.")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = multiprocessing.Process(target=run, args=(config_from_arguments(args), "127.0.0.1", port), daemon=True)
+    server.start()
+    server_url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(wait_until_ready(f"{server_url}/__stats"))
+        asyncio.run(benchmark(args, server_url))
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
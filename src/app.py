@@ -1,3 +1,4 @@
+import contextlib
 from abc import ABC
 
 import uvicorn
@@ -5,16 +6,26 @@ from fastapi import FastAPI
 
 from src.application.usecase.analytics import AnalyticsUseCase
 from src.application.usecase.home import HomeUseCase
+from src.application.usecase.monitoring import MonitoringUseCase
 from src.config.settings import settings
 from src.application.usecase.activity import ActivityUseCase
-from src.infrastructure.db.postgres.session import DatabaseSessionManager
+from src.infrastructure.db.postgres.session import DatabaseSessionManager, InstrumentedAsyncAdaptedQueuePool
+from src.infrastructure.external.http.ratelimit import TokenBucketRateLimiter
+from src.infrastructure.external.http.retry import RetryPolicy
+from src.infrastructure.external.http.session import HTTPSessionManager
 from src.infrastructure.external.phantombuster.adapter import PhantomBusterAgentAdapter, PhantomBusterContainerAdapter
 from src.infrastructure.provider.activity import PhantomBusterWithPGActivityProvider
-from src.infrastructure.provider.analytics import CustomFromDFAnalyticsReportProvider
+from src.infrastructure.provider.analytics import (
+    CustomFromDFAnalyticsReportProvider,
+    PostgresAggregateAnalyticsReportProvider,
+)
 from src.infrastructure.repository.activity.postgres import ActivityRepository
+from src.infrastructure.runner.executor import ExecutorManager
+from src.infrastructure.runner.job import InProcessJobRunner
 from src.presentation.fastapi.controller.activity import ActivityController
 from src.presentation.fastapi.controller.analytics import AnalyticsController
 from src.presentation.fastapi.controller.home import HomeController
+from src.presentation.fastapi.controller.monitoring import MonitoringController
 
 
 class BaseApplication(ABC):
@@ -37,34 +48,95 @@ class FastAPIWebApplication(BaseApplication):
     """
 
     def __init__(self):
-        self.__fastapi_app = FastAPI()
-
+        self.__fastapi_app = FastAPI(lifespan=self.__lifespan)
+
+        self.http_session_manager = HTTPSessionManager(
+            connector_kwargs={
+                "limit": settings.http_pool_size,
+                "limit_per_host": settings.http_pool_size_per_host,
+                "ttl_dns_cache": settings.http_dns_cache_ttl,
+                "keepalive_timeout": settings.http_keepalive_timeout,
+            },
+            timeout_kwargs={
+                "total": settings.http_total_timeout,
+                "connect": settings.http_connect_timeout,
+            }
+        )
+        # Both adapters share the same API key, hence the same quota and the same limiter.
+        self.phantom_buster_rate_limiter = TokenBucketRateLimiter(
+            rate=settings.phantom_buster_rate_limit,
+            capacity=settings.phantom_buster_rate_burst
+        )
+        self.phantom_buster_retry_policy = RetryPolicy(
+            max_retries=settings.phantom_buster_max_retries,
+            backoff_base=settings.phantom_buster_backoff_base,
+            backoff_max=settings.phantom_buster_backoff_max
+        )
         self.phantom_buster_agent_adapter = PhantomBusterAgentAdapter(
             settings.phantom_buster_api_key,
-            settings.phantom_buster_base_url
+            settings.phantom_buster_base_url,
+            self.http_session_manager,
+            self.phantom_buster_rate_limiter,
+            self.phantom_buster_retry_policy
         )
         self.phantom_buster_container_adapter = PhantomBusterContainerAdapter(
             settings.phantom_buster_api_key,
-            settings.phantom_buster_base_url
+            settings.phantom_buster_base_url,
+            self.http_session_manager,
+            self.phantom_buster_rate_limiter,
+            self.phantom_buster_retry_policy
         )
 
         self.pg_session_manager = DatabaseSessionManager(
             host=str(settings.pg_dsn).replace("postgresql", "postgresql+asyncpg"),
-            engine_kwargs={"echo": True},
-            session_maker_kwargs={'autoflush': True, 'expire_on_commit': False, 'future': True}
+            engine_kwargs={
+                "echo": settings.pg_echo,
+                "poolclass": InstrumentedAsyncAdaptedQueuePool,
+                "pool_size": settings.pg_pool_size,
+                "max_overflow": settings.pg_max_overflow,
+                "pool_timeout": settings.pg_pool_timeout,
+                "pool_recycle": settings.pg_pool_recycle,
+                "pool_pre_ping": settings.pg_pool_pre_ping,
+                "connect_args": {"prepared_statement_cache_size": settings.pg_prepared_statement_cache_size},
+            },
+            session_maker_kwargs={'autoflush': True, 'expire_on_commit': False, 'future': True},
+            reader_hosts=[str(dsn).replace("postgresql", "postgresql+asyncpg") for dsn in settings.pg_reader_dsns],
+            reader_retry_interval=settings.pg_reader_retry_interval
         )
         self.activity_provider = PhantomBusterWithPGActivityProvider(
             phantombuster_agent_adapter=self.phantom_buster_agent_adapter,
             phantombuster_container_adapter=self.phantom_buster_container_adapter,
-            session_manager=self.pg_session_manager
+            session_manager=self.pg_session_manager,
+            concurrency=settings.phantom_buster_sync_concurrency
         )
-        self.analytics_provider = CustomFromDFAnalyticsReportProvider()
+        # The reports are computed off the event loop, so they do not stall the other requests.
+        self.analytics_executor = None
+        if settings.analytics_executor != "none":
+            self.analytics_executor = ExecutorManager(
+                kind=settings.analytics_executor,
+                max_workers=settings.analytics_executor_workers
+            )
+        if settings.analytics_provider == "sql":
+            self.analytics_provider = PostgresAggregateAnalyticsReportProvider(
+                session_manager=self.pg_session_manager,
+                use_rollups=settings.analytics_use_rollups,
+                executor=self.analytics_executor
+            )
+        else:
+            self.analytics_provider = CustomFromDFAnalyticsReportProvider(executor=self.analytics_executor)
         self.activity_repository = ActivityRepository(
-            session_manager=self.pg_session_manager
+            session_manager=self.pg_session_manager,
+            ingest_mode=settings.activity_ingest_mode,
+            retain_months=settings.activity_partition_retain_months
+        )
+        self.job_runner = InProcessJobRunner(
+            max_concurrent_jobs=settings.sync_max_concurrent_jobs
         )
         self.activity_usecase = ActivityUseCase(
             activity_provider=self.activity_provider,
-            activity_repo=self.activity_repository
+            activity_repo=self.activity_repository,
+            job_runner=self.job_runner,
+            sync_batch_size=settings.sync_batch_size
         )
         self.home_usecase = HomeUseCase(
             activity_repo=self.activity_repository
@@ -74,6 +146,26 @@ class FastAPIWebApplication(BaseApplication):
             activity_repo=self.activity_repository,
             analytics_provider=self.analytics_provider
         )
+        self.monitoring_usecase = MonitoringUseCase(
+            db_pool_stats=self.pg_session_manager.pool_stats
+        )
+
+    @contextlib.asynccontextmanager
+    async def __lifespan(self, app: FastAPI):
+        """
+        This method opens the shared resources on startup and releases them on shutdown.
+        """
+        await self.http_session_manager.open()
+        if self.analytics_executor is not None:
+            await self.analytics_executor.open()
+        try:
+            yield
+        finally:
+            await self.job_runner.close()
+            if self.analytics_executor is not None:
+                await self.analytics_executor.close()
+            await self.http_session_manager.close()
+            await self.pg_session_manager.close()
 
     @property
     def activity_router(self):
@@ -102,6 +194,15 @@ class FastAPIWebApplication(BaseApplication):
             analytics_usecase=self.analytics_usecase
         ).register()
 
+    @property
+    def monitoring_router(self):
+        """
+        This method returns the monitoring router.
+        """
+        return MonitoringController(
+            monitoring_usecase=self.monitoring_usecase
+        ).register()
+
     def __setup(self) -> None:
         """
         This method sets up the FastAPI web application.
@@ -109,6 +210,7 @@ class FastAPIWebApplication(BaseApplication):
         self.__fastapi_app.include_router(self.home_router)
         self.__fastapi_app.include_router(self.activity_router)
         self.__fastapi_app.include_router(self.analytics_router)
+        self.__fastapi_app.include_router(self.monitoring_router)
 
     def run(self) -> None:
         """
@@ -1,38 +1,105 @@
-from src.domain.entity import ActivityFilter
+from src.domain.entity import ActivityFilter, ActivityPage
 from src.domain.entity.activity import Activity
+from src.domain.entity.job import SyncJob, SyncProgress
 from src.domain.provider.activity import BaseActivityProvider
 from src.domain.repository.activity import BaseActivityRepository
+from src.domain.runner.job import BaseJobRunner
 from abc import ABC, abstractmethod
+from contextlib import aclosing
+from typing import AsyncIterator
 
 
 class BaseActivityUseCase(ABC):
     @abstractmethod
-    async def sync(self) -> list[Activity]:
+    async def sync(self, progress: SyncProgress | None = None) -> int:
         """
-        Get activities with filters.
+        Sync the new activities from the provider and return the number of the stored ones.
         """
         ...
 
     @abstractmethod
-    async def list(self, filters: ActivityFilter | None, limit: int, offset: int) -> list[Activity]:
+    def export(self, filters: ActivityFilter, batch_size: int) -> AsyncIterator[list[Activity]]:
         """
-        List all activities.
+        Stream all the activities matching the filters in chunks.
+        """
+        ...
+
+    @abstractmethod
+    async def start_sync(self) -> SyncJob:
+        """
+        Start the sync as a background job.
+        """
+        ...
+
+    @abstractmethod
+    async def get_sync_job(self, job_id: str) -> SyncJob | None:
+        """
+        Get a sync job by its ID.
+        """
+        ...
+
+    @abstractmethod
+    async def list(self, filters: ActivityFilter | None, limit: int, offset: int,
+                   cursor: str | None = None, search: str | None = None) -> ActivityPage:
+        """
+        List a page of activities.
         """
         ...
 
 
 class ActivityUseCase(BaseActivityUseCase):
-    def __init__(self, activity_repo: BaseActivityRepository, activity_provider: BaseActivityProvider):
+    def __init__(
+            self,
+            activity_repo: BaseActivityRepository,
+            activity_provider: BaseActivityProvider,
+            job_runner: BaseJobRunner,
+            sync_batch_size: int = 1000
+    ):
         self.activity_repo = activity_repo
         self.activity_provider = activity_provider
+        self.job_runner = job_runner
+        self.sync_batch_size = sync_batch_size
 
-    async def sync(self) -> list[Activity]:
+    async def sync(self, progress: SyncProgress | None = None) -> int:
         # figure out how to avoid using multiple context managers for same purpose.
         async with self.activity_provider as provider, self.activity_repo as repo:
-            activities = await provider.sync()
-            results = await repo.bulk_create(activities)
-            return results
+            progress = progress or SyncProgress()
+            batch: list[Activity] = []
+            # Closed right away if a flush fails, so the fetching workers of the stream do not linger.
+            async with aclosing(provider.stream(progress=progress)) as stream:
+                async for activities in stream:
+                    batch.extend(activities)
+                    # A large container may fill several batches.
+                    while len(batch) >= self.sync_batch_size:
+                        progress.rows_inserted += await self.__flush(repo, batch[:self.sync_batch_size])
+                        batch = batch[self.sync_batch_size:]
+            if batch:
+                progress.rows_inserted += await self.__flush(repo, batch)
+            return progress.rows_inserted
+
+    async def export(self, filters: ActivityFilter, batch_size: int) -> AsyncIterator[list[Activity]]:
+        async with self.activity_repo as repo, aclosing(repo.stream(filters, batch_size)) as batches:
+            async for activities in batches:
+                yield activities
+
+    async def start_sync(self) -> SyncJob:
+        return await self.job_runner.submit(SyncJob(), lambda job: self.sync(progress=job.progress))
+
+    async def get_sync_job(self, job_id: str) -> SyncJob | None:
+        return await self.job_runner.get(job_id)
+
+    @staticmethod
+    async def __flush(repo: BaseActivityRepository, batch: list[Activity]) -> int:
+        """
+        Store the batch and commit it, so the already synced containers survive a later failure.
+        The stored activities also update the profiles and the monthly analytics rollups, in the same transaction.
+        Returns the number of inserted (not already stored) activities.
+        """
+        inserted = await repo.bulk_create(batch)
+        await repo.commit()
+        return len(inserted)
 
-    async def list(self, filters: ActivityFilter, limit: int, offset: int) -> list[Activity]:
+    async def list(self, filters: ActivityFilter, limit: int, offset: int,
+                   cursor: str | None = None, search: str | None = None) -> ActivityPage:
         async with self.activity_repo as repo:
-            return await repo.list(filters, limit, offset)
+            return await repo.list_page(filters, limit, offset, cursor, search)
@@ -1,4 +1,3 @@
-from src.domain.entity import ActivityFilter
 from src.domain.entity.analytics.filter import AnalyticsReportFilter
 from src.domain.entity.analytics.model import AnalyticsReport
 from src.domain.provider.analytics import BaseAnalyticsReportProvider
@@ -22,5 +21,9 @@ class AnalyticsUseCase(BaseAnalyticsUseCase):
 
     async def generate_report(self, profile_url: str, filters: AnalyticsReportFilter) -> AnalyticsReport:
         async with self.activity_repo as repo, self.analytics_provider as provider:
-            activities = await repo.list(ActivityFilter(profile_url=profile_url))
-            return await provider.generate_report(activities=activities)
+            activity_filter = filters.to_activity_filter(profile_url)
+            report = await provider.query_report(activity_filter)
+            if report is None:
+                activities = await repo.list(activity_filter, columns=provider.required_fields)
+                report = await provider.generate_report(activities=activities)
+            return report
@@ -1,12 +1,13 @@
+from src.domain.entity.profile import Profile
 from src.domain.repository.activity import BaseActivityRepository
 from abc import ABC, abstractmethod
 
 
 class BaseHomeUseCase(ABC):
     @abstractmethod
-    async def list_distinct_profiles(self) -> list[str]:
+    async def list_profiles(self) -> list[Profile]:
         """
-        Get distinct profiles.
+        Get the profiles with their counters.
         """
         ...
 
@@ -15,6 +16,6 @@ class HomeUseCase(BaseHomeUseCase):
     def __init__(self, activity_repo: BaseActivityRepository):
         self.activity_repo = activity_repo
 
-    async def list_distinct_profiles(self) -> list[str]:
+    async def list_profiles(self) -> list[Profile]:
         async with self.activity_repo as repo:
-            return await repo.list_distinct_profiles()
+            return await repo.list_profiles()
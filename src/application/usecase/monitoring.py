@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+
+
+class BaseMonitoringUseCase(ABC):
+    @abstractmethod
+    async def db_pool_stats(self) -> dict[str, Any]:
+        """
+        Get the live statistics of the database connection pool.
+        """
+        ...
+
+
+class MonitoringUseCase(BaseMonitoringUseCase):
+    def __init__(self, db_pool_stats: Callable[[], dict[str, Any]]):
+        self._db_pool_stats = db_pool_stats
+
+    async def db_pool_stats(self) -> dict[str, Any]:
+        return self._db_pool_stats()
@@ -2,6 +2,8 @@
 This module contains the settings for the application.
 """
 
+from typing import Literal
+
 from pydantic import (
     PostgresDsn,
     Field,
@@ -24,8 +26,49 @@ class Settings(BaseSettings):
     pg_name: str = Field(..., alias="POSTGRES_DB", env="POSTGRES_DB")
     pg_user: str = Field(..., alias="POSTGRES_USER", env="POSTGRES_USER")
     pg_password: str = Field(..., alias="POSTGRES_PASSWORD", env="POSTGRES_PASSWORD")
+    # Comma separated "host:port" list of the read replicas (same database and credentials as the primary).
+    pg_reader_hosts: str = Field("", alias="POSTGRES_READER_HOSTS", env="POSTGRES_READER_HOSTS")
+    pg_reader_retry_interval: float = Field(30, alias="POSTGRES_READER_RETRY_INTERVAL",
+                                            env="POSTGRES_READER_RETRY_INTERVAL")
+    pg_echo: bool = Field(False, alias="POSTGRES_ECHO", env="POSTGRES_ECHO")
+    pg_pool_size: int = Field(10, alias="POSTGRES_POOL_SIZE", env="POSTGRES_POOL_SIZE")
+    pg_max_overflow: int = Field(20, alias="POSTGRES_MAX_OVERFLOW", env="POSTGRES_MAX_OVERFLOW")
+    pg_pool_timeout: float = Field(30, alias="POSTGRES_POOL_TIMEOUT", env="POSTGRES_POOL_TIMEOUT")
+    pg_pool_recycle: int = Field(1800, alias="POSTGRES_POOL_RECYCLE", env="POSTGRES_POOL_RECYCLE")
+    pg_pool_pre_ping: bool = Field(True, alias="POSTGRES_POOL_PRE_PING", env="POSTGRES_POOL_PRE_PING")
+    # Set to 0 behind a transaction-pooling PgBouncer, which does not support prepared statements.
+    pg_prepared_statement_cache_size: int = Field(100, alias="POSTGRES_PREPARED_STATEMENT_CACHE_SIZE",
+                                                  env="POSTGRES_PREPARED_STATEMENT_CACHE_SIZE")
     phantom_buster_api_key: str = Field(..., alias="PHANTOM_BUSTER_API_KEY", env="PHANTOM_BUSTER_API_KEY")
     phantom_buster_base_url: str = Field(..., alias="PHANTOM_BUSTER_BASE_URL", env="PHANTOM_BUSTER_BASE_URL")
+    phantom_buster_sync_concurrency: int = Field(8, alias="PHANTOM_BUSTER_SYNC_CONCURRENCY",
+                                                 env="PHANTOM_BUSTER_SYNC_CONCURRENCY")
+    phantom_buster_rate_limit: float = Field(10, alias="PHANTOM_BUSTER_RATE_LIMIT", env="PHANTOM_BUSTER_RATE_LIMIT")
+    phantom_buster_rate_burst: float = Field(10, alias="PHANTOM_BUSTER_RATE_BURST", env="PHANTOM_BUSTER_RATE_BURST")
+    phantom_buster_max_retries: int = Field(5, alias="PHANTOM_BUSTER_MAX_RETRIES", env="PHANTOM_BUSTER_MAX_RETRIES")
+    phantom_buster_backoff_base: float = Field(0.5, alias="PHANTOM_BUSTER_BACKOFF_BASE",
+                                               env="PHANTOM_BUSTER_BACKOFF_BASE")
+    phantom_buster_backoff_max: float = Field(30, alias="PHANTOM_BUSTER_BACKOFF_MAX", env="PHANTOM_BUSTER_BACKOFF_MAX")
+    activity_ingest_mode: Literal["copy", "insert", "orm"] = Field("copy", alias="ACTIVITY_INGEST_MODE",
+                                                                 env="ACTIVITY_INGEST_MODE")
+    # Months of activities kept in the attached partitions (None keeps all of them); older posts are not ingested.
+    activity_partition_retain_months: int | None = Field(None, alias="ACTIVITY_PARTITION_RETAIN_MONTHS",
+                                                         env="ACTIVITY_PARTITION_RETAIN_MONTHS")
+    sync_batch_size: int = Field(1000, alias="SYNC_BATCH_SIZE", env="SYNC_BATCH_SIZE")
+    analytics_provider: Literal["sql", "pandas"] = Field("sql", alias="ANALYTICS_PROVIDER", env="ANALYTICS_PROVIDER")
+    analytics_use_rollups: bool = Field(True, alias="ANALYTICS_USE_ROLLUPS", env="ANALYTICS_USE_ROLLUPS")
+    analytics_executor: Literal["process", "thread", "none"] = Field("process", alias="ANALYTICS_EXECUTOR",
+                                                                    env="ANALYTICS_EXECUTOR")
+    analytics_executor_workers: int = Field(2, alias="ANALYTICS_EXECUTOR_WORKERS", env="ANALYTICS_EXECUTOR_WORKERS")
+    sync_max_concurrent_jobs: int = Field(1, alias="SYNC_MAX_CONCURRENT_JOBS", env="SYNC_MAX_CONCURRENT_JOBS")
+
+    # HTTP client (connection pool) settings
+    http_pool_size: int = Field(100, alias="HTTP_POOL_SIZE", env="HTTP_POOL_SIZE")
+    http_pool_size_per_host: int = Field(20, alias="HTTP_POOL_SIZE_PER_HOST", env="HTTP_POOL_SIZE_PER_HOST")
+    http_dns_cache_ttl: int = Field(300, alias="HTTP_DNS_CACHE_TTL", env="HTTP_DNS_CACHE_TTL")
+    http_keepalive_timeout: float = Field(30, alias="HTTP_KEEPALIVE_TIMEOUT", env="HTTP_KEEPALIVE_TIMEOUT")
+    http_connect_timeout: float = Field(10, alias="HTTP_CONNECT_TIMEOUT", env="HTTP_CONNECT_TIMEOUT")
+    http_total_timeout: float = Field(120, alias="HTTP_TOTAL_TIMEOUT", env="HTTP_TOTAL_TIMEOUT")
 
     @computed_field
     def pg_dsn(self) -> PostgresDsn:
@@ -38,6 +81,21 @@ class Settings(BaseSettings):
             path=self.pg_name or "",
         )
 
+    @computed_field
+    def pg_reader_dsns(self) -> list[PostgresDsn]:
+        dsns = []
+        for reader in filter(None, (host.strip() for host in self.pg_reader_hosts.split(","))):
+            host, _, port = reader.partition(":")
+            dsns.append(PostgresDsn.build(
+                scheme="postgresql",
+                username=self.pg_user,
+                password=self.pg_password,
+                host=host,
+                port=int(port) if port else self.pg_port,
+                path=self.pg_name or "",
+            ))
+        return dsns
+
     class Config:
         env_prefix = ""
         case_sensitive = False
@@ -1,2 +1,3 @@
 from .model import Activity
-from .filter import ActivityFilter
+from .filter import ActivityFilter, ActivityRangeFilter
+from .page import ActivityPage
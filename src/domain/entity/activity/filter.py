@@ -3,7 +3,23 @@ from pydantic import BaseModel, Field, AliasChoices
 from src.utils import types
 
 
-class ActivityFilter(BaseModel):
+class ActivityRangeFilter(BaseModel):
+    """
+    Range predicates on the activity timestamps and counters.
+    The `_from`, `_min` and `_max` bounds are inclusive, the `_to` bounds are exclusive.
+    """
+
+    timestamp_from: types.OpNaiveUtcDttm = Field(None, validation_alias=AliasChoices("timestampFrom", "timestamp_from"))
+    timestamp_to: types.OpNaiveUtcDttm = Field(None, validation_alias=AliasChoices("timestampTo", "timestamp_to"))
+    like_count_min: types.OpInt = Field(None, validation_alias=AliasChoices("likeCountMin", "like_count_min"))
+    like_count_max: types.OpInt = Field(None, validation_alias=AliasChoices("likeCountMax", "like_count_max"))
+    comment_count_min: types.OpInt = Field(None, validation_alias=AliasChoices("commentCountMin", "comment_count_min"))
+    comment_count_max: types.OpInt = Field(None, validation_alias=AliasChoices("commentCountMax", "comment_count_max"))
+    repost_count_min: types.OpInt = Field(None, validation_alias=AliasChoices("repostCountMin", "repost_count_min"))
+    repost_count_max: types.OpInt = Field(None, validation_alias=AliasChoices("repostCountMax", "repost_count_max"))
+
+
+class ActivityFilter(ActivityRangeFilter):
     post_url: types.OpStr = Field(None, validation_alias=AliasChoices("postUrl", "post_url"))
     type: types.OpStr = Field(None, validation_alias=AliasChoices("type"))
     video_url: types.OpStr = Field(None, validation_alias=AliasChoices("videoUrl", "video_url"))
@@ -17,6 +33,10 @@ class ActivityFilter(BaseModel):
     profile_url: types.OpStr = Field(None, validation_alias=AliasChoices("profileUrl", "profile_url"))
     timestamp: types.OpCoercedDtOrDttm = Field(None, validation_alias=AliasChoices("timestamp"))
     post_timestamp: types.OpCoercedDtOrDttm = Field(None, validation_alias=AliasChoices("postTimestamp", "post_timestamp"))
+    post_timestamp_from: types.OpNaiveUtcDttm = Field(
+        None, validation_alias=AliasChoices("postTimestampFrom", "post_timestamp_from"))
+    post_timestamp_to: types.OpNaiveUtcDttm = Field(
+        None, validation_alias=AliasChoices("postTimestampTo", "post_timestamp_to"))
     agent_id: types.OpStr = Field(None, validation_alias=AliasChoices("agentId"))
     container_id: types.OpStr = Field(None, validation_alias=AliasChoices("containerId"))
 
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field, AliasChoices
+
+from src.domain.entity.activity.model import Activity
+from src.utils import types
+
+
+class ActivityPage(BaseModel):
+    items: list[Activity] = Field(default_factory=list, validation_alias=AliasChoices("items"))
+    next_cursor: types.OpStr = Field(None, validation_alias=AliasChoices("nextCursor", "next_cursor"))
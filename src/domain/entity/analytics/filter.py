@@ -1,17 +1,29 @@
 """
 This module contains the filter for the analytics entity.
 """
-from datetime import datetime
-from typing import Optional
+from pydantic import Field, AliasChoices
 
-from pydantic import BaseModel, Field, AliasChoices
+from src.domain.entity.activity.filter import ActivityFilter, ActivityRangeFilter
+from src.utils import types
 
 
-class AnalyticsReportFilter(BaseModel):
+class AnalyticsReportFilter(ActivityRangeFilter):
     """
     Analytics report filter model.
+    The report covers the activities posted from `start_date` (inclusive) to `end_date` (exclusive).
     """
 
-    start_date: Optional[datetime] = Field(None, validation_alias=AliasChoices("startDate", "start_date"))
-    end_date: Optional[datetime] = Field(None, validation_alias=AliasChoices("endDate", "end_date"))
+    start_date: types.OpNaiveUtcDttm = Field(None, validation_alias=AliasChoices("startDate", "start_date"))
+    end_date: types.OpNaiveUtcDttm = Field(None, validation_alias=AliasChoices("endDate", "end_date"))
+
+    def to_activity_filter(self, profile_url: str) -> ActivityFilter:
+        """
+        The filter of the activities the report is computed from.
+        """
+        return ActivityFilter(
+            profile_url=profile_url,
+            post_timestamp_from=self.start_date,
+            post_timestamp_to=self.end_date,
+            **self.model_dump(exclude={"start_date", "end_date"}, exclude_none=True),
+        )
 
@@ -0,0 +1,97 @@
+"""
+This module contains the model for the monthly analytics rollup entity.
+"""
+from datetime import date, datetime
+from typing import Iterable, List
+
+from pydantic import BaseModel, Field, AliasChoices
+
+from src.domain.entity.activity.model import Activity
+from src.domain.entity.analytics.model import AnalyticsReport
+from src.utils import text
+
+
+class AnalyticsMonthlyRollup(BaseModel):
+    """
+    Partial sums and counts of the activities of a profile posted in a month.
+    Rollups add up, so a report over any range of months is computed from the rollups of these months.
+    """
+
+    profile_url: str = Field(..., validation_alias=AliasChoices("profileUrl", "profile_url"))
+    month: date = Field(..., validation_alias=AliasChoices("month"))
+    post_count: int = Field(0, validation_alias=AliasChoices("postCount", "post_count"))
+    text_length_sum: int = Field(0, validation_alias=AliasChoices("textLengthSum", "text_length_sum"))
+    emoji_sum: int = Field(0, validation_alias=AliasChoices("emojiSum", "emoji_sum"))
+    like_sum: int = Field(0, validation_alias=AliasChoices("likeSum", "like_sum"))
+    comment_sum: int = Field(0, validation_alias=AliasChoices("commentSum", "comment_sum"))
+    paragraph_sum: int = Field(0, validation_alias=AliasChoices("paragraphSum", "paragraph_sum"))
+    hashtag_sum: int = Field(0, validation_alias=AliasChoices("hashtagSum", "hashtag_sum"))
+    visual_count: int = Field(0, validation_alias=AliasChoices("visualCount", "visual_count"))
+    first_post_timestamp: datetime | None = Field(
+        None, validation_alias=AliasChoices("firstPostTimestamp", "first_post_timestamp"))
+    last_post_timestamp: datetime | None = Field(
+        None, validation_alias=AliasChoices("lastPostTimestamp", "last_post_timestamp"))
+
+    def add(self, activity: Activity) -> None:
+        """
+        Add an activity of the profile and month to the rollup.
+        """
+        self.post_count += 1
+        self.text_length_sum += len(activity.post_content or "")
+        self.emoji_sum += text.count_emojis(activity.post_content)
+        self.like_sum += activity.like_count or 0
+        self.comment_sum += activity.comment_count or 0
+        self.paragraph_sum += text.count_paragraphs(activity.post_content)
+        self.hashtag_sum += text.count_hashtags(activity.post_content)
+        self.visual_count += activity.img_url is not None or activity.video_url is not None
+        self.first_post_timestamp = min(filter(None, (self.first_post_timestamp, activity.post_timestamp)))
+        self.last_post_timestamp = max(filter(None, (self.last_post_timestamp, activity.post_timestamp)))
+
+    def merge(self, other: "AnalyticsMonthlyRollup") -> "AnalyticsMonthlyRollup":
+        """
+        Add another rollup of the same profile and month to this one.
+        """
+        for field in ("post_count", "text_length_sum", "emoji_sum", "like_sum", "comment_sum", "paragraph_sum",
+                      "hashtag_sum", "visual_count"):
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        self.first_post_timestamp = min(filter(None, (self.first_post_timestamp, other.first_post_timestamp)))
+        self.last_post_timestamp = max(filter(None, (self.last_post_timestamp, other.last_post_timestamp)))
+        return self
+
+    @classmethod
+    def from_activities(cls, activities: Iterable[Activity]) -> List["AnalyticsMonthlyRollup"]:
+        """
+        Roll the activities up per profile and month.
+        """
+        rollups: dict[tuple[str, date], AnalyticsMonthlyRollup] = {}
+        for activity in activities:
+            month = date(activity.post_timestamp.year, activity.post_timestamp.month, 1)
+            key = (activity.profile_url, month)
+            if key not in rollups:
+                rollups[key] = cls(profile_url=activity.profile_url, month=month)
+            rollups[key].add(activity)
+        return [rollups[key] for key in sorted(rollups)]
+
+
+def report_from_rollups(rollups: List[AnalyticsMonthlyRollup]) -> AnalyticsReport:
+    """
+    Compute the analytics report of the activities summed up by the rollups.
+    Raises ValueError if they do not contain any activity.
+    """
+    rollups = [rollup for rollup in rollups if rollup.post_count]
+    count = sum(rollup.post_count for rollup in rollups)
+    if not count:
+        raise ValueError("No activities match the report filters")
+    return AnalyticsReport(
+        start_date=min(rollup.first_post_timestamp for rollup in rollups),
+        end_date=max(rollup.last_post_timestamp for rollup in rollups),
+        average_text_length=sum(rollup.text_length_sum for rollup in rollups) / count,
+        average_postings_per_month=count / len({rollup.month for rollup in rollups}),
+        average_headline_length=0,
+        average_emojis=sum(rollup.emoji_sum for rollup in rollups) / count,
+        average_likes=sum(rollup.like_sum for rollup in rollups) / count,
+        average_comments=sum(rollup.comment_sum for rollup in rollups) / count,
+        average_paragraphs=sum(rollup.paragraph_sum for rollup in rollups) / count,
+        average_hashtags=sum(rollup.hashtag_sum for rollup in rollups) / count,
+        percentage_visuals_used=sum(rollup.visual_count for rollup in rollups) / count,
+    )
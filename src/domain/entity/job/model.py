@@ -0,0 +1,47 @@
+"""
+This module contains the model for the background sync job entity.
+"""
+from datetime import datetime
+from enum import Enum
+from uuid import uuid4
+
+from pydantic import BaseModel, Field, AliasChoices
+
+from src.utils import types
+
+
+class SyncJobStatus(str, Enum):
+    """
+    Lifecycle status of a sync job.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class SyncProgress(BaseModel):
+    """
+    Progress counters of a sync job, updated in place while the sync runs.
+    """
+
+    agents_scanned: int = Field(0, validation_alias=AliasChoices("agentsScanned", "agents_scanned"))
+    containers_fetched: int = Field(0, validation_alias=AliasChoices("containersFetched", "containers_fetched"))
+    rows_inserted: int = Field(0, validation_alias=AliasChoices("rowsInserted", "rows_inserted"))
+    errors: int = Field(0, validation_alias=AliasChoices("errors"))
+
+
+class SyncJob(BaseModel):
+    """
+    Sync job model.
+    """
+
+    id: str = Field(default_factory=lambda: uuid4().hex, validation_alias=AliasChoices("id"))
+    status: SyncJobStatus = Field(SyncJobStatus.PENDING, validation_alias=AliasChoices("status"))
+    progress: SyncProgress = Field(default_factory=SyncProgress, validation_alias=AliasChoices("progress"))
+    error: types.OpStr = Field(None, validation_alias=AliasChoices("error"))
+    created_at: datetime = Field(default_factory=datetime.utcnow, validation_alias=AliasChoices("createdAt",
+                                                                                                "created_at"))
+    started_at: datetime | None = Field(None, validation_alias=AliasChoices("startedAt", "started_at"))
+    finished_at: datetime | None = Field(None, validation_alias=AliasChoices("finishedAt", "finished_at"))
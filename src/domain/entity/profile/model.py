@@ -0,0 +1,20 @@
+"""
+This module contains the model for the profile entity.
+"""
+from datetime import datetime
+
+from pydantic import BaseModel, Field, AliasChoices
+
+
+class Profile(BaseModel):
+    """
+    A scraped profile with the counters of its stored activities.
+    """
+
+    profile_url: str = Field(..., validation_alias=AliasChoices("profileUrl", "profile_url"))
+    activity_count: int = Field(0, validation_alias=AliasChoices("activityCount", "activity_count"))
+    first_post_timestamp: datetime | None = Field(
+        None, validation_alias=AliasChoices("firstPostTimestamp", "first_post_timestamp"))
+    last_post_timestamp: datetime | None = Field(
+        None, validation_alias=AliasChoices("lastPostTimestamp", "last_post_timestamp"))
+    last_synced_at: datetime | None = Field(None, validation_alias=AliasChoices("lastSyncedAt", "last_synced_at"))
@@ -3,8 +3,10 @@ This module contains the interface for the activity provider.
 """
 
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 from src.domain.entity import Activity
+from src.domain.entity.job import SyncProgress
 
 
 class BaseActivityProvider(ABC):
@@ -22,6 +24,14 @@ class BaseActivityProvider(ABC):
         """
         ...
 
+    @abstractmethod
+    def stream(self, progress: SyncProgress | None = None) -> AsyncIterator[list[Activity]]:
+        """
+        Yield the new activities in chunks (e.g. one chunk per source container) as they are fetched.
+        If `progress` is given, its counters are updated while streaming.
+        """
+        ...
+
     @abstractmethod
     async def __aenter__(self):
         """
@@ -3,10 +3,9 @@ This module contains the interface for the analytics report provider.
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Tuple
 
-from src.domain.entity import Activity
-from src.domain.entity.analytics.filter import AnalyticsReportFilter
+from src.domain.entity import Activity, ActivityFilter
 from src.domain.entity.analytics.model import AnalyticsReport
 
 
@@ -18,10 +17,21 @@ class BaseAnalyticsReportProvider(ABC):
     that any subclass-related setup is done properly.
     """
 
+    # Activity fields the report is computed from (None means all of them).
+    required_fields: Tuple[str, ...] | None = None
+
     @abstractmethod
     async def generate_report(self, activities: List[Activity]) -> AnalyticsReport:
         ...
 
+    async def query_report(self, filters: ActivityFilter) -> AnalyticsReport | None:
+        """
+        Compute the report of the activities matching the filters where they are stored, without loading them.
+        Returns None if the provider cannot do so (the default): the activities are then loaded
+        and passed to `generate_report`.
+        """
+        return None
+
     @abstractmethod
     async def __aenter__(self):
         """
@@ -3,9 +3,10 @@ This module contains the interface for the activity repository.
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import AsyncIterator, List, Sequence
 
-from src.domain.entity import ActivityFilter, Activity
+from src.domain.entity import ActivityFilter, Activity, ActivityPage
+from src.domain.entity.profile import Profile
 
 
 class BaseActivityRepository(ABC):
@@ -46,23 +47,61 @@ class BaseActivityRepository(ABC):
         ...
 
     @abstractmethod
-    async def list(self, filters: ActivityFilter, limit: int, offset: int) -> List[Activity]:
+    async def list(self, filters: ActivityFilter, limit: int, offset: int,
+                   columns: Sequence[str] | None = None) -> List[Activity]:
         """
-        List all activities.
+        List all activities. If `columns` is given, only these entity fields are read.
         """
         ...
 
     @abstractmethod
-    async def list_distinct_profiles(self) -> List[str]:
+    def stream(self, filters: ActivityFilter, batch_size: int = 1000,
+               columns: Sequence[str] | None = None) -> AsyncIterator[List[Activity]]:
         """
-        Get distinct profiles.
+        Stream all the activities matching the filters in chunks of `batch_size`,
+        without materialising the whole result.
+        """
+        ...
+
+    @abstractmethod
+    async def list_page(self, filters: ActivityFilter, limit: int, offset: int = 0,
+                        cursor: str | None = None, search: str | None = None) -> ActivityPage:
+        """
+        List a page of activities, newest first.
+        If `cursor` (the `next_cursor` of the previous page) is given, the page starts right after it
+        and `offset` is ignored.
+        If `search` (a web-search-like text query) is given, only the activities whose post content
+        matches it are listed, the most relevant first.
+        """
+        ...
+
+    @abstractmethod
+    async def list_profiles(self, limit: int = None, offset: int = None) -> List[Profile]:
+        """
+        List the profiles with the counters of their activities, ordered by URL.
         """
         ...
 
     @abstractmethod
     async def bulk_create(self, activities: List[Activity]) -> List[Activity]:
         """
-        Bulk create activities.
+        Bulk create activities, skipping the already stored ones,
+        and keep the counters of their profiles and their monthly analytics rollups up to date.
+        Returns the inserted activities.
+        """
+        ...
+
+    @abstractmethod
+    async def rebuild_rollups(self, batch_size: int = 1000) -> int:
+        """
+        Recompute the monthly analytics rollups from the stored activities. Returns the number of rollups.
+        """
+        ...
+
+    @abstractmethod
+    async def commit(self) -> None:
+        """
+        Commit the pending changes of the current session.
         """
         ...
 
@@ -0,0 +1,35 @@
+"""
+This module contains the interface for the background job runner.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable
+
+from src.domain.entity.job import SyncJob
+
+
+class BaseJobRunner(ABC):
+    """
+    Interface for the background job runner.
+    """
+
+    @abstractmethod
+    async def submit(self, job: SyncJob, func: Callable[[SyncJob], Awaitable]) -> SyncJob:
+        """
+        Schedule `func(job)` to run in the background and return the job right away.
+        """
+        ...
+
+    @abstractmethod
+    async def get(self, job_id: str) -> SyncJob | None:
+        """
+        Get a job by its ID.
+        """
+        ...
+
+    @abstractmethod
+    async def close(self) -> None:
+        """
+        Cancel the unfinished jobs and release the resources.
+        """
+        ...
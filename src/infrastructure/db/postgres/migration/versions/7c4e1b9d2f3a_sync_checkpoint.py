@@ -0,0 +1,34 @@
+"""sync checkpoint
+
+Revision ID: 7c4e1b9d2f3a
+Revises: 2a9adaed4bd9
+Create Date: 2026-10-18 10:12:41.502113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c4e1b9d2f3a'
+down_revision: Union[str, None] = '2a9adaed4bd9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('sync_checkpoints',
+    sa.Column('agent_id', sa.String(), nullable=False),
+    sa.Column('last_container_id', sa.String(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('agent_id')
+    )
+    # The checkpoints are not seeded from the stored activities: a container that failed before this migration
+    # stored nothing, so the database cannot tell the gaps apart. The first sync establishes the checkpoints,
+    # from the containers it finds stored and the ones it fetches.
+
+
+def downgrade() -> None:
+    op.drop_table('sync_checkpoints')
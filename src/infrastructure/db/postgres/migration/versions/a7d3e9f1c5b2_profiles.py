@@ -0,0 +1,40 @@
+"""profiles
+
+Revision ID: a7d3e9f1c5b2
+Revises: f2c6d8a4e0b7
+Create Date: 2026-10-18 15:20:37.084519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e9f1c5b2'
+down_revision: Union[str, None] = 'f2c6d8a4e0b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('profiles',
+    sa.Column('profile_url', sa.String(), nullable=False),
+    sa.Column('activity_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('first_post_timestamp', sa.DateTime(), nullable=True),
+    sa.Column('last_post_timestamp', sa.DateTime(), nullable=True),
+    sa.Column('last_synced_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('profile_url')
+    )
+    # Seed the profiles from the already stored activities; the newest scrape stands for the last sync.
+    op.execute("""
+        INSERT INTO profiles (profile_url, activity_count, first_post_timestamp, last_post_timestamp, last_synced_at)
+        SELECT profile_url, count(*), min(post_timestamp), max(post_timestamp), max(timestamp)
+        FROM activities
+        GROUP BY profile_url
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('profiles')
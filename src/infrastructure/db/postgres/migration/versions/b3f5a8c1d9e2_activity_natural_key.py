@@ -0,0 +1,36 @@
+"""activity natural key
+
+Revision ID: b3f5a8c1d9e2
+Revises: 7c4e1b9d2f3a
+Create Date: 2026-10-18 11:03:27.118642
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f5a8c1d9e2'
+down_revision: Union[str, None] = '7c4e1b9d2f3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Drop the duplicates piled up by the re-runs, keeping the first inserted row of every natural key.
+    op.execute("""
+        DELETE FROM activities a
+        USING activities b
+        WHERE a.container_id = b.container_id
+          AND a.post_url = b.post_url
+          AND a.action = b.action
+          AND a.id > b.id
+    """)
+    op.create_unique_constraint('uq_activities_container_id_post_url_action', 'activities',
+                                ['container_id', 'post_url', 'action'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_activities_container_id_post_url_action', 'activities', type_='unique')
@@ -0,0 +1,34 @@
+"""activity post content search
+
+Revision ID: c9b2f4d6a8e1
+Revises: a7d3e9f1c5b2
+Create Date: 2026-10-18 16:04:12.730961
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9b2f4d6a8e1'
+down_revision: Union[str, None] = 'a7d3e9f1c5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A stored generated column is computed for the existing rows as well (the partitions are rewritten).
+    op.add_column('activities', sa.Column(
+        'post_content_tsv', postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('english', coalesce(post_content, ''))", persisted=True), nullable=True
+    ))
+    op.create_index('ix_activities_post_content_tsv', 'activities', ['post_content_tsv'], unique=False,
+                    postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_activities_post_content_tsv', table_name='activities')
+    op.drop_column('activities', 'post_content_tsv')
@@ -0,0 +1,38 @@
+"""activity indexes
+
+Revision ID: d41e7a2b6c08
+Revises: b3f5a8c1d9e2
+Create Date: 2026-10-18 11:41:52.307219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41e7a2b6c08'
+down_revision: Union[str, None] = 'b3f5a8c1d9e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('ix_activities_profile_url_post_timestamp', ['profile_url', 'post_timestamp']),
+    ('ix_activities_agent_id_container_id', ['agent_id', 'container_id']),
+    ('ix_activities_post_timestamp', ['post_timestamp']),
+)
+
+
+def upgrade() -> None:
+    # Built concurrently (outside of the migration transaction) so the ingestion is not blocked.
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, 'activities', columns, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.drop_index(name, table_name='activities', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,42 @@
+"""analytics monthly rollups
+
+Revision ID: d5f1a3c7e9b4
+Revises: c9b2f4d6a8e1
+Create Date: 2026-10-18 17:31:48.902264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f1a3c7e9b4'
+down_revision: Union[str, None] = 'c9b2f4d6a8e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The emojis are counted in Python, so the table is filled by the backfill command
+    # (`make analytics-rollups`) rather than here.
+    op.create_table('analytics_monthly_rollups',
+    sa.Column('profile_url', sa.String(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('post_count', sa.Integer(), nullable=False),
+    sa.Column('text_length_sum', sa.BigInteger(), nullable=False),
+    sa.Column('emoji_sum', sa.BigInteger(), nullable=False),
+    sa.Column('like_sum', sa.BigInteger(), nullable=False),
+    sa.Column('comment_sum', sa.BigInteger(), nullable=False),
+    sa.Column('paragraph_sum', sa.BigInteger(), nullable=False),
+    sa.Column('hashtag_sum', sa.BigInteger(), nullable=False),
+    sa.Column('visual_count', sa.Integer(), nullable=False),
+    sa.Column('first_post_timestamp', sa.DateTime(), nullable=False),
+    sa.Column('last_post_timestamp', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('profile_url', 'month')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('analytics_monthly_rollups')
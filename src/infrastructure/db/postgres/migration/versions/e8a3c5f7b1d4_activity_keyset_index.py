@@ -0,0 +1,36 @@
+"""activity keyset index
+
+Revision ID: e8a3c5f7b1d4
+Revises: d41e7a2b6c08
+Create Date: 2026-10-18 12:15:09.861530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a3c5f7b1d4'
+down_revision: Union[str, None] = 'd41e7a2b6c08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (post_timestamp, id) serves the keyset pagination and, as a prefix, everything the
+    # post_timestamp index served, so the latter is replaced.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_activities_post_timestamp_id', 'activities', ['post_timestamp', 'id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_activities_post_timestamp', table_name='activities',
+                      postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_activities_post_timestamp', 'activities', ['post_timestamp'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_activities_post_timestamp_id', table_name='activities',
+                      postgresql_concurrently=True, if_exists=True)
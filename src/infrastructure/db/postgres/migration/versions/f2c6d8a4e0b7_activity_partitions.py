@@ -0,0 +1,121 @@
+"""activity partitions
+
+Revision ID: f2c6d8a4e0b7
+Revises: e8a3c5f7b1d4
+Create Date: 2026-10-18 14:02:51.417208
+
+"""
+import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6d8a4e0b7'
+down_revision: Union[str, None] = 'e8a3c5f7b1d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions created ahead of the current month; afterwards they are kept ahead by
+# `python -m src.infrastructure.db.postgres.partition` and, for older posts, by the ingest itself.
+MONTHS_AHEAD = 3
+
+COLUMNS = [
+    'id', 'post_url', 'type', 'video_url', 'img_url', 'post_content', 'like_count', 'comment_count',
+    'repost_count', 'post_date', 'action', 'profile_url', 'timestamp', 'post_timestamp', 'agent_id', 'container_id',
+]
+
+
+def _columns() -> list[sa.Column]:
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('activities_id_seq')"), nullable=False),
+        sa.Column('post_url', sa.String(), nullable=False),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('video_url', sa.String(), nullable=True),
+        sa.Column('img_url', sa.String(), nullable=True),
+        sa.Column('post_content', sa.String(), nullable=False),
+        sa.Column('like_count', sa.Integer(), nullable=False),
+        sa.Column('comment_count', sa.Integer(), nullable=False),
+        sa.Column('repost_count', sa.Integer(), nullable=False),
+        sa.Column('post_date', sa.String(), nullable=True),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('profile_url', sa.String(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), nullable=False),
+        sa.Column('post_timestamp', sa.DateTime(), nullable=False),
+        sa.Column('agent_id', sa.String(), nullable=False),
+        sa.Column('container_id', sa.String(), nullable=False),
+    ]
+
+
+def _add_months(month: datetime.date, months: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def _swap(new_table: str) -> None:
+    """
+    Copy the rows into `new_table` and put it in place of `activities`, keeping the id sequence.
+    """
+    columns = ', '.join(f'"{column}"' for column in COLUMNS)
+    op.execute(f'INSERT INTO {new_table} ({columns}) SELECT {columns} FROM activities')
+    op.execute('ALTER SEQUENCE activities_id_seq OWNED BY NONE')
+    op.drop_table('activities')
+    op.rename_table(new_table, 'activities')
+    op.execute('ALTER SEQUENCE activities_id_seq OWNED BY activities.id')
+
+
+def _create_constraints(unique_columns: list[str]) -> None:
+    # Indexes on a partitioned table cannot be built concurrently; they are built per partition.
+    op.create_unique_constraint('uq_activities_container_id_post_url_action', 'activities', unique_columns)
+    op.create_index('ix_activities_profile_url_post_timestamp', 'activities', ['profile_url', 'post_timestamp'])
+    op.create_index('ix_activities_agent_id_container_id', 'activities', ['agent_id', 'container_id'])
+    op.create_index('ix_activities_post_timestamp_id', 'activities', ['post_timestamp', 'id'])
+
+
+def upgrade() -> None:
+    # Partitioned tables need the partition key in every unique constraint,
+    # so post_timestamp joins both the primary key and the natural key.
+    op.create_table('activities_partitioned',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id', 'post_timestamp', name='activities_partitioned_pkey'),
+    postgresql_partition_by='RANGE (post_timestamp)'
+    )
+
+    oldest = op.get_bind().execute(sa.text('SELECT min(post_timestamp) FROM activities')).scalar()
+    today = datetime.date.today()
+    month = datetime.date((oldest or today).year, (oldest or today).month, 1)
+    last = _add_months(datetime.date(today.year, today.month, 1), MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE activities_p{month:%Y_%m} PARTITION OF activities_partitioned "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+
+    _swap('activities_partitioned')
+    op.execute('ALTER TABLE activities RENAME CONSTRAINT activities_partitioned_pkey TO activities_pkey')
+    _create_constraints(['container_id', 'post_url', 'action', 'post_timestamp'])
+
+
+def downgrade() -> None:
+    op.create_table('activities_unpartitioned',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id', name='activities_unpartitioned_pkey')
+    )
+    # Rows that only differ by post_timestamp were distinct under the partitioned natural key;
+    # keep the first of them, as the previous constraint allows only one.
+    columns = ', '.join(f'"{column}"' for column in COLUMNS)
+    op.execute(
+        f'INSERT INTO activities_unpartitioned ({columns}) '
+        f'SELECT DISTINCT ON (container_id, post_url, action) {columns} FROM activities '
+        f'ORDER BY container_id, post_url, action, id'
+    )
+    op.execute('ALTER SEQUENCE activities_id_seq OWNED BY NONE')
+    # Dropping the partitioned table drops its partitions as well.
+    op.drop_table('activities')
+    op.rename_table('activities_unpartitioned', 'activities')
+    op.execute('ALTER SEQUENCE activities_id_seq OWNED BY activities.id')
+    op.execute('ALTER TABLE activities RENAME CONSTRAINT activities_unpartitioned_pkey TO activities_pkey')
+    _create_constraints(['container_id', 'post_url', 'action'])
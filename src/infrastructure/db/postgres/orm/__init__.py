@@ -1 +1,4 @@
 from .activity import Activity  # Important for Alembic to detect the model
+from .sync_checkpoint import SyncCheckpoint
+from .profile import Profile
+from .analytics_rollup import AnalyticsMonthlyRollup
@@ -2,10 +2,14 @@
 This module contains the ORM (SQLAlchemy) models for the activity table in Postgres.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Computed, Integer, String, DateTime, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR
 
 from src.infrastructure.db.postgres.orm.base import Base
 
+# Text search configuration of the post content; the search queries must use the same one to hit the index.
+TEXT_SEARCH_CONFIG = "english"
+
 
 class Activity(Base):
     """
@@ -13,8 +17,21 @@ class Activity(Base):
     """
 
     __tablename__ = "activities"
+    __table_args__ = (
+        # Natural key of an activity: a post/action pair as scraped by a given container.
+        # The table is partitioned by month of post_timestamp, and a unique constraint of a partitioned
+        # table must contain the partition key, hence post_timestamp in it (and in the primary key).
+        UniqueConstraint("container_id", "post_url", "action", "post_timestamp",
+                         name="uq_activities_container_id_post_url_action"),
+        Index("ix_activities_profile_url_post_timestamp", "profile_url", "post_timestamp"),
+        Index("ix_activities_agent_id_container_id", "agent_id", "container_id"),
+        Index("ix_activities_post_timestamp_id", "post_timestamp", "id"),
+        Index("ix_activities_post_content_tsv", "post_content_tsv", postgresql_using="gin"),
+        {"extend_existing": True, "postgresql_partition_by": "RANGE (post_timestamp)"},
+    )
+    natural_key = ("container_id", "post_url", "action", "post_timestamp")
 
-    id = Column(Integer, primary_key=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     post_url = Column(String, nullable=False)
     type = Column(String, nullable=False)
     video_url = Column(String, nullable=True)
@@ -27,9 +44,13 @@ class Activity(Base):
     action = Column(String, nullable=False)
     profile_url = Column(String, nullable=False)
     timestamp = Column(DateTime, nullable=False)
-    post_timestamp = Column(DateTime, nullable=False)
+    post_timestamp = Column(DateTime, nullable=False, primary_key=True)
     agent_id = Column(String, nullable=False)
     container_id = Column(String, nullable=False)
+    post_content_tsv = Column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(post_content, ''))", persisted=True),
+    )
 
     def __repr__(self):
         return (
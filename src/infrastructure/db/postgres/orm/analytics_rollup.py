@@ -0,0 +1,42 @@
+"""
+This module contains the ORM (SQLAlchemy) models for the monthly analytics rollup table in Postgres.
+"""
+
+from sqlalchemy import BigInteger, Column, Date, DateTime, Integer, String
+
+from src.infrastructure.db.postgres.orm.base import Base
+
+
+class AnalyticsMonthlyRollup(Base):
+    """
+    ORM model for the monthly analytics rollup table.
+
+    Partial sums and counts of the activities per profile and month of post_timestamp, incremented by the
+    activity ingest and rebuilt by `python -m src.infrastructure.db.postgres.rollup`.
+    """
+
+    __tablename__ = "analytics_monthly_rollups"
+    # Counters incremented on conflict; the first / last post timestamps are merged with LEAST / GREATEST.
+    sums = (
+        "post_count", "text_length_sum", "emoji_sum", "like_sum", "comment_sum", "paragraph_sum", "hashtag_sum",
+        "visual_count",
+    )
+
+    profile_url = Column(String, primary_key=True)
+    month = Column(Date, primary_key=True)
+    post_count = Column(Integer, nullable=False)
+    text_length_sum = Column(BigInteger, nullable=False)
+    emoji_sum = Column(BigInteger, nullable=False)
+    like_sum = Column(BigInteger, nullable=False)
+    comment_sum = Column(BigInteger, nullable=False)
+    paragraph_sum = Column(BigInteger, nullable=False)
+    hashtag_sum = Column(BigInteger, nullable=False)
+    visual_count = Column(Integer, nullable=False)
+    first_post_timestamp = Column(DateTime, nullable=False)
+    last_post_timestamp = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<AnalyticsMonthlyRollup(profile_url={self.profile_url}, month={self.month}, "
+            f"post_count={self.post_count})>"
+        )
@@ -0,0 +1,31 @@
+"""
+This module contains the ORM (SQLAlchemy) models for the profile table in Postgres.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime
+
+from src.infrastructure.db.postgres.orm.base import Base
+
+
+class Profile(Base):
+    """
+    ORM model for the profile table.
+
+    One row per scraped profile, maintained by the activity ingest, so the profiles
+    and their counters are read without scanning the activities.
+    """
+
+    __tablename__ = "profiles"
+
+    profile_url = Column(String, primary_key=True)
+    activity_count = Column(Integer, nullable=False, server_default="0")
+    first_post_timestamp = Column(DateTime, nullable=True)
+    last_post_timestamp = Column(DateTime, nullable=True)
+    last_synced_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return (
+            f"<Profile(profile_url={self.profile_url}, activity_count={self.activity_count}, "
+            f"first_post_timestamp={self.first_post_timestamp}, last_post_timestamp={self.last_post_timestamp}, "
+            f"last_synced_at={self.last_synced_at})>"
+        )
@@ -0,0 +1,27 @@
+"""
+This module contains the ORM (SQLAlchemy) models for the sync checkpoint table in Postgres.
+"""
+
+from sqlalchemy import Column, String, DateTime
+
+from src.infrastructure.db.postgres.orm.base import Base
+
+
+class SyncCheckpoint(Base):
+    """
+    ORM model for the sync checkpoint table.
+
+    Holds, per agent, the newest container up to which every container has been synced.
+    """
+
+    __tablename__ = "sync_checkpoints"
+
+    agent_id = Column(String, primary_key=True)
+    last_container_id = Column(String, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<SyncCheckpoint(agent_id={self.agent_id}, last_container_id={self.last_container_id}, "
+            f"updated_at={self.updated_at})>"
+        )
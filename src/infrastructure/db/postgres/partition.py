@@ -0,0 +1,222 @@
+"""
+This module contains the helpers for the monthly range partitions of the activities table,
+and the maintenance command that creates the future partitions and detaches the old ones
+(taking their activities out of the profiles and the monthly rollups).
+
+Usage:
+    python -m src.infrastructure.db.postgres.partition --ahead 3 [--retain 24]
+"""
+import argparse
+import asyncio
+import datetime
+import logging
+import typing as t
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.infrastructure.db.postgres.orm import analytics_rollup as rollup_orm
+from src.infrastructure.db.postgres.orm import profile as profile_orm
+
+logger = logging.getLogger(__name__)
+
+PARTITION_SUFFIX = "_p"
+ARCHIVED_SUFFIX = "_archived"
+
+
+def month_start(value: datetime.date | datetime.datetime) -> datetime.date:
+    return datetime.date(value.year, value.month, 1)
+
+
+def add_months(month: datetime.date, months: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: datetime.date) -> str:
+    return f"{table}{PARTITION_SUFFIX}{month:%Y_%m}"
+
+
+def create_partition_sql(table: str, month: datetime.date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+async def ensure_partitions(
+        connection: AsyncConnection | AsyncSession,
+        table: str,
+        months: t.Iterable[datetime.date]
+) -> None:
+    """
+    Create the partitions of the given months if they do not exist yet.
+    """
+    for month in sorted(set(months)):
+        await connection.execute(text(create_partition_sql(table, month)))
+
+
+def parse_partition_name(table: str, name: str, suffix: str = "") -> datetime.date | None:
+    """
+    The month of a partition (with the given suffix, e.g. `ARCHIVED_SUFFIX`), or None if the name is not one.
+    """
+    prefix = f"{table}{PARTITION_SUFFIX}"
+    if not name.startswith(prefix) or not name.endswith(suffix):
+        return None
+    try:
+        return datetime.datetime.strptime(name[len(prefix):len(name) - len(suffix)], "%Y_%m").date()
+    except ValueError:
+        return None
+
+
+async def list_partitions(connection: AsyncConnection | AsyncSession, table: str) -> list[datetime.date]:
+    """
+    List the months of the attached partitions.
+    """
+    result = await connection.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :table
+    """), {"table": table})
+    return sorted(filter(None, (parse_partition_name(table, name) for name in result.scalars())))
+
+
+async def list_archived_partitions(connection: AsyncConnection | AsyncSession, table: str) -> list[datetime.date]:
+    """
+    List the months of the detached (archived) partitions.
+    """
+    result = await connection.execute(
+        text("SELECT relname FROM pg_class WHERE relkind = 'r' AND relname LIKE :pattern"),
+        {"pattern": f"{table}%{ARCHIVED_SUFFIX}"}
+    )
+    return sorted(filter(None, (parse_partition_name(table, name, ARCHIVED_SUFFIX) for name in result.scalars())))
+
+
+def retention_horizon(retain: int | None, today: datetime.date | None = None) -> datetime.date | None:
+    """
+    The oldest month kept when retaining `retain` months (None keeps all of them).
+    """
+    if retain is None:
+        return None
+    return add_months(month_start(today or datetime.date.today()), -retain)
+
+
+async def creation_horizon(
+        connection: AsyncConnection | AsyncSession,
+        table: str,
+        retain: int | None = None,
+        today: datetime.date | None = None
+) -> datetime.date | None:
+    """
+    The oldest month a partition may be created for (None if any may be): the retention horizon, and the month
+    after the newest archived partition. A fresh partition of an archived month would not see the archived rows,
+    so their natural keys would no longer prevent duplicates.
+    """
+    archived = await list_archived_partitions(connection, table)
+    horizons = [retention_horizon(retain, today)] + ([add_months(archived[-1], 1)] if archived else [])
+    return max(filter(None, horizons), default=None)
+
+
+async def discount_partition(connection: AsyncConnection, name: str, month: datetime.date) -> None:
+    """
+    Take the activities of a detached partition out of the counters of their profiles and drop their monthly
+    rollups, so both keep covering the attached activities alone, as the SQL aggregates and the rollup rebuild do.
+    """
+    profiles = profile_orm.Profile.__tablename__
+    await connection.execute(text(f"""
+        UPDATE {profiles}
+        SET activity_count = {profiles}.activity_count - archived.activity_count
+        FROM (SELECT profile_url, count(*) AS activity_count FROM {name} GROUP BY profile_url) AS archived
+        WHERE {profiles}.profile_url = archived.profile_url
+    """))
+    await connection.execute(
+        text(f"DELETE FROM {rollup_orm.AnalyticsMonthlyRollup.__tablename__} WHERE month = :month"),
+        {"month": month}
+    )
+
+
+async def refresh_profile_bounds(connection: AsyncConnection, table: str, before: datetime.date) -> None:
+    """
+    Recompute the first / last post timestamps of the profiles whose first post is older than `before`,
+    from the attached activities.
+    """
+    profiles = profile_orm.Profile.__tablename__
+    await connection.execute(text(f"""
+        UPDATE {profiles}
+        SET first_post_timestamp = (
+                SELECT min(post_timestamp) FROM {table} WHERE {table}.profile_url = {profiles}.profile_url),
+            last_post_timestamp = (
+                SELECT max(post_timestamp) FROM {table} WHERE {table}.profile_url = {profiles}.profile_url)
+        WHERE first_post_timestamp < :before
+    """), {"before": before})
+
+
+async def maintain(
+        connection: AsyncConnection,
+        table: str,
+        ahead: int,
+        retain: int | None = None,
+        today: datetime.date | None = None
+) -> tuple[list[datetime.date], list[datetime.date]]:
+    """
+    Create the partitions of the current and the next `ahead` months, and, if `retain` is given, detach
+    the partitions older than `retain` months. The detached partitions are kept as `<name>_archived` tables,
+    and no partition is created again for their months (see `creation_horizon`). Their activities are taken
+    out of the profiles and the monthly rollups (see `discount_partition`) in the same transaction.
+    Returns the created and the detached months.
+    """
+    current = month_start(today or datetime.date.today())
+    existing = set(await list_partitions(connection, table))
+
+    created = [add_months(current, offset) for offset in range(ahead + 1)
+               if add_months(current, offset) not in existing]
+    await ensure_partitions(connection, table, created)
+
+    detached = []
+    if retain is not None:
+        oldest_kept = retention_horizon(retain, current)
+        for month in sorted(existing):
+            if month >= oldest_kept:
+                break
+            name = partition_name(table, month)
+            # Detached first: the lock on the whole table waits for the running ingests, which update the profiles
+            # and the rollups after the activities, so they cannot deadlock with the updates below.
+            await connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            await discount_partition(connection, name, month)
+            await connection.execute(text(f"ALTER TABLE {name} RENAME TO {name}{ARCHIVED_SUFFIX}"))
+            detached.append(month)
+        if detached:
+            await refresh_profile_bounds(connection, table, oldest_kept)
+    return created, detached
+
+
+async def main(args: argparse.Namespace) -> None:
+    from src.config.settings import settings
+    from src.infrastructure.db.postgres.orm import activity as activity_orm
+    from src.infrastructure.db.postgres.session import DatabaseSessionManager
+
+    session_manager = DatabaseSessionManager(
+        host=str(settings.pg_dsn).replace("postgresql", "postgresql+asyncpg"),
+        engine_kwargs={},
+        session_maker_kwargs={}
+    )
+    try:
+        async with session_manager.connect() as connection:
+            created, detached = await maintain(
+                connection, activity_orm.Activity.__tablename__, ahead=args.ahead,
+                retain=args.retain if args.retain is not None else settings.activity_partition_retain_months)
+    finally:
+        await session_manager.close()
+    print(f"created: {', '.join(f'{month:%Y-%m}' for month in created) or '-'}")
+    print(f"detached: {', '.join(f'{month:%Y-%m}' for month in detached) or '-'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the monthly partitions of the activities table.")
+    parser.add_argument("--ahead", type=int, default=3, help="Months to create ahead of the current one.")
+    parser.add_argument("--retain", type=int, default=None,
+                        help="Detach the partitions older than this many months "
+                             "(default: ACTIVITY_PARTITION_RETAIN_MONTHS, or keep all).")
+    asyncio.run(main(parser.parse_args()))
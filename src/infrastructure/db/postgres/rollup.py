@@ -0,0 +1,33 @@
+"""
+This module contains the backfill command of the monthly analytics rollups: it recomputes them
+from the stored activities, e.g. after the rollup table is created or if the rollups drifted.
+
+Usage:
+    python -m src.infrastructure.db.postgres.rollup [--batch-size 1000]
+"""
+import argparse
+import asyncio
+
+
+async def main(args: argparse.Namespace) -> None:
+    from src.config.settings import settings
+    from src.infrastructure.db.postgres.session import DatabaseSessionManager
+    from src.infrastructure.repository.activity.postgres import ActivityRepository
+
+    session_manager = DatabaseSessionManager(
+        host=str(settings.pg_dsn).replace("postgresql", "postgresql+asyncpg"),
+        engine_kwargs={},
+        session_maker_kwargs={'autoflush': True, 'expire_on_commit': False, 'future': True}
+    )
+    try:
+        async with ActivityRepository(session_manager=session_manager) as repo:
+            count = await repo.rebuild_rollups(batch_size=args.batch_size)
+    finally:
+        await session_manager.close()
+    print(f"rebuilt: {count} rollups")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the monthly analytics rollups from the activities.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Activities read (and rollups written) at a time.")
+    asyncio.run(main(parser.parse_args()))
@@ -1,4 +1,8 @@
 import contextlib
+import contextvars
+import itertools
+import logging
+import time
 from typing import Any, AsyncIterator
 
 from sqlalchemy.ext.asyncio import (
@@ -7,25 +11,130 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that also records how long the checkouts took
+    (waiting for a free connection, or opening a new one).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started_at
+            self.checkouts += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+
+
+class _Scope:
+    """
+    A scope of a `ScopedSession`: its session, and the token restoring the stack as it was before it was entered.
+    """
+
+    __slots__ = ("session", "token")
+
+    def __init__(self, session: AsyncSession | None):
+        self.session = session
+        self.token: contextvars.Token | None = None
+
+
+class ScopedSession:
+    """
+    Holds the current session of a repository (or provider) per asyncio context.
+
+    Every request and every background job runs in its own task, hence in its own context,
+    so a single repository instance can be shared by concurrent requests without one of them
+    overwriting the session of another. Nested scopes within a context are stacked.
+
+    A scope MUST be exited in the context it was entered in: an async generator holding a scope
+    has to be closed by the task iterating it (e.g. with `contextlib.aclosing`), not left to the garbage collector.
+    """
+
+    def __init__(self, name: str):
+        self._scopes: contextvars.ContextVar[tuple[_Scope, ...]] = contextvars.ContextVar(name, default=())
+
+    def push(self, session: AsyncSession | None) -> contextvars.Token:
+        scope = _Scope(session)
+        scope.token = self._scopes.set(self._scopes.get() + (scope,))
+        return scope.token
+
+    def pop(self) -> AsyncSession | None:
+        """
+        Exit the innermost scope, restoring the stack with its token, and return its session.
+        Raises RuntimeError outside the context the scope was entered in, instead of exiting a scope of another one.
+        """
+        scopes = self._scopes.get()
+        if not scopes:
+            raise RuntimeError("No session scope to exit in this context")
+        scope = scopes[-1]
+        try:
+            self._scopes.reset(scope.token)
+        except ValueError as exc:
+            raise RuntimeError("The session scope is exited outside the context it was entered in") from exc
+        return scope.session
+
+    def replace(self, session: AsyncSession | None) -> None:
+        """
+        Replace the session of the innermost scope.
+        """
+        self._scopes.get()[-1].session = session
+
+    @property
+    def current(self) -> AsyncSession | None:
+        scopes = self._scopes.get()
+        return scopes[-1].session if scopes else None
 
 
 class DatabaseSessionManager:
+    """
+    Manages the engine of the primary (writer) database and, optionally, the engines of its read replicas.
+
+    Read sessions are handed out round-robin among the replicas. A replica reported as failing is skipped
+    for `reader_retry_interval` seconds; with no replica available, the readers fall back to the primary.
+    """
+
     def __init__(
             self,
             host: str,
             engine_kwargs: dict[str, Any] | None,
             session_maker_kwargs: dict[str, Any] | None,
+            reader_hosts: list[str] | None = None,
+            reader_retry_interval: float = 30,
     ):
         self._engine = create_async_engine(host, **engine_kwargs)
         self._session_maker = async_sessionmaker(bind=self._engine, **session_maker_kwargs)
+        self._reader_engines = [create_async_engine(reader_host, **engine_kwargs) for reader_host in reader_hosts or []]
+        self._reader_session_makers = [
+            async_sessionmaker(bind=reader_engine, **session_maker_kwargs) for reader_engine in self._reader_engines
+        ]
+        self._reader_turn = itertools.count()
+        self._reader_down_until: dict[int, float] = {}
+        self._reader_retry_interval = reader_retry_interval
 
     async def close(self):
         if self._engine is None:
             raise Exception("DatabaseSessionManager is not initialized")
         await self._engine.dispose()
+        for reader_engine in self._reader_engines:
+            await reader_engine.dispose()
 
         self._engine = None
         self._session_maker = None
+        self._reader_engines = []
+        self._reader_session_makers = []
 
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
@@ -57,6 +166,40 @@ class DatabaseSessionManager:
             await session.close()
             print("Session is closed after commit.")
 
+    def pool_stats(self) -> dict[str, Any]:
+        """
+        Live statistics of the connection pools.
+        """
+        if self._engine is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+
+        stats = self._pool_stats(self._engine.pool)
+        if self._reader_engines:
+            stats["readers"] = [
+                self._pool_stats(reader_engine.pool) | {"down": index in self._down_readers()}
+                for index, reader_engine in enumerate(self._reader_engines)
+            ]
+        return stats
+
+    @staticmethod
+    def _pool_stats(pool) -> dict[str, Any]:
+        stats: dict[str, Any] = {"status": pool.status()}
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats |= {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        if isinstance(pool, InstrumentedAsyncAdaptedQueuePool):
+            stats |= {
+                "checkouts": pool.checkouts,
+                "wait_time_total": round(pool.wait_time_total, 6),
+                "wait_time_avg": round(pool.wait_time_total / pool.checkouts, 6) if pool.checkouts else 0.0,
+                "wait_time_max": round(pool.wait_time_max, 6),
+            }
+        return stats
+
     def give_session(self) -> AsyncSession:
         if self._session_maker is None:
             raise Exception("DatabaseSessionManager is not initialized")
@@ -64,3 +207,31 @@ class DatabaseSessionManager:
         session = self._session_maker()
         return session
 
+    def give_read_session(self) -> AsyncSession | None:
+        """
+        Give a session bound to the next healthy read replica,
+        or None if there is none (the caller should use the primary then).
+        """
+        if not self._reader_session_makers:
+            return None
+
+        down = self._down_readers()
+        for _ in range(len(self._reader_session_makers)):
+            index = next(self._reader_turn) % len(self._reader_session_makers)
+            if index not in down:
+                return self._reader_session_makers[index]()
+        return None
+
+    def mark_reader_down(self, session: AsyncSession) -> None:
+        """
+        Report the replica of the session as failing, so it is skipped for a while.
+        """
+        for index, reader_engine in enumerate(self._reader_engines):
+            if session.bind is reader_engine:
+                logger.warning("Read replica #%d is failing, skipping it for %ss.", index, self._reader_retry_interval)
+                self._reader_down_until[index] = time.monotonic() + self._reader_retry_interval
+
+    def _down_readers(self) -> set[int]:
+        now = time.monotonic()
+        return {index for index, down_until in self._reader_down_until.items() if down_until > now}
+
@@ -0,0 +1,116 @@
+"""
+This module contains the client-side rate limiter for the external HTTP APIs.
+"""
+import asyncio
+import datetime
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a `Retry-After` header (delay in seconds or an HTTP date) into seconds to wait.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    return max((retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0)
+
+
+def parse_rate_limit_reset(value: str | None) -> float | None:
+    """
+    Parse a `X-RateLimit-Reset` header into seconds to wait.
+    Both the "seconds until reset" and the "epoch seconds of reset" flavours are accepted.
+    """
+    if not value:
+        return None
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+    if reset > 1_000_000_000:
+        reset -= time.time()
+    return max(reset, 0.0)
+
+
+class TokenBucketRateLimiter:
+    """
+    Adaptive token bucket shared by all the adapters that use the same API quota.
+
+    Tokens refill at `rate` per second up to `capacity`. When the server throttles us, the rate is halved
+    (down to `min_rate`) and every request is held back until the server-provided delay has passed;
+    successful responses grow the rate back additively up to the configured maximum.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None, min_rate: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.min_rate = min_rate or rate / 16
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """
+        Wait until a request may be sent.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def block_for(self, delay: float) -> None:
+        """
+        Hold back every request for `delay` seconds.
+        """
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        self._tokens = 0
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def on_throttled(self, delay: float | None = None) -> None:
+        self.rate = max(self.min_rate, self.rate / 2)
+        if delay:
+            self.block_for(delay)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Pause until the quota window resets when the server reports it as exhausted.
+        """
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        try:
+            exhausted = float(remaining) <= 0
+        except ValueError:
+            return
+        if exhausted:
+            delay = parse_rate_limit_reset(headers.get("X-RateLimit-Reset"))
+            if delay:
+                self.block_for(delay)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
@@ -0,0 +1,28 @@
+"""
+This module contains the retry policy for the external HTTP APIs.
+"""
+import random
+
+from pydantic import BaseModel, Field
+
+
+class RetryPolicy(BaseModel):
+    """
+    Retry policy with jittered ("full jitter") exponential backoff.
+    """
+
+    max_retries: int = Field(3, ge=0)
+    backoff_base: float = Field(0.5, gt=0)
+    backoff_max: float = Field(30, gt=0)
+    retry_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Delay before the retry following the given (zero based) attempt.
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def should_retry(self, attempt: int, status_code: int | None = None) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        return status_code is None or status_code in self.retry_statuses
@@ -0,0 +1,53 @@
+"""
+This module contains the manager of the shared (pooled) HTTP client session.
+"""
+from typing import Any
+
+import aiohttp
+
+
+class HTTPSessionManager:
+    """
+    Owns a single long-lived `aiohttp.ClientSession` whose connector pools connections
+    (keep-alive, DNS cache, per-host limits) across all the adapters that share it.
+
+    The session MUST be opened from within a running event loop (e.g. the application lifespan)
+    and closed when the application shuts down.
+    """
+
+    def __init__(
+            self,
+            connector_kwargs: dict[str, Any] | None = None,
+            timeout_kwargs: dict[str, Any] | None = None,
+            session_kwargs: dict[str, Any] | None = None,
+    ):
+        self._connector_kwargs = connector_kwargs or {}
+        self._timeout_kwargs = timeout_kwargs or {}
+        self._session_kwargs = session_kwargs or {}
+        self._session: aiohttp.ClientSession | None = None
+
+    async def open(self) -> None:
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(**self._connector_kwargs)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(**self._timeout_kwargs),
+            **self._session_kwargs
+        )
+
+    async def close(self) -> None:
+        if self._session is None:
+            return
+        await self._session.close()
+        self._session = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._session is not None and not self._session.closed
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if not self.is_open:
+            raise Exception("HTTPSessionManager is not initialized")
+        return self._session
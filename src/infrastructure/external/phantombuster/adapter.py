@@ -1,17 +1,36 @@
+import asyncio
+import logging
+from typing import Mapping
 from urllib.parse import urljoin
+from src.infrastructure.external.http.ratelimit import TokenBucketRateLimiter, parse_retry_after
+from src.infrastructure.external.http.retry import RetryPolicy
+from src.infrastructure.external.http.session import HTTPSessionManager
 from src.infrastructure.external.phantombuster.schema import APIResponse
+from src.utils import serialization
 
 import aiohttp
 
+logger = logging.getLogger(__name__)
+
 
 class PhantomBusterAdapterBase:
     """
     Adapter for the PhantomBuster API.
     """
 
-    def __init__(self, api_key: str, base_url: str) -> None:
+    def __init__(
+            self,
+            api_key: str,
+            base_url: str,
+            http_session_manager: HTTPSessionManager | None = None,
+            rate_limiter: TokenBucketRateLimiter | None = None,
+            retry_policy: RetryPolicy | None = None
+    ) -> None:
         self._api_key = api_key
         self._base_url = base_url
+        self._http_session_manager = http_session_manager
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy or RetryPolicy(max_retries=0)
         self.default_headers = {"X-Phantombuster-Key": self._api_key}
 
     async def request(
@@ -23,18 +42,83 @@ class PhantomBusterAdapterBase:
     ) -> APIResponse:
         """
         Make a request to the PhantomBuster API.
+
+        Requests go through the rate limiter (if any), and transient failures (connection errors,
+        timeouts, 429 and 5xx responses) are retried with jittered exponential backoff,
+        honouring the `Retry-After` header.
         """
         full_url = urljoin(self._base_url, url)
         full_headers = (headers or {}) | self.default_headers
 
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire()
+            try:
+                response, response_headers = await self._request_once(method, full_url, payload, full_headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                if not self._retry_policy.should_retry(attempt):
+                    raise
+                delay = self._retry_policy.backoff(attempt)
+                logger.warning("%s %s failed (%r), retrying in %.2fs.", method, url, exc, delay)
+            else:
+                delay = self._handle_rate_limit(response, response_headers)
+                if response.ok or not self._retry_policy.should_retry(attempt, response.status_code):
+                    return response
+                delay = max(delay or 0, self._retry_policy.backoff(attempt))
+                logger.warning("%s %s returned %s, retrying in %.2fs.", method, url, response.status_code, delay)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def _handle_rate_limit(self, response: APIResponse, headers: Mapping[str, str]) -> float | None:
+        """
+        Feed the response into the rate limiter and return the server-requested delay, if any.
+        """
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if self._rate_limiter is None:
+            return retry_after
+        self._rate_limiter.update_from_headers(headers)
+        if response.status_code == 429:
+            self._rate_limiter.on_throttled(retry_after)
+        elif response.ok:
+            self._rate_limiter.on_success()
+        return retry_after
+
+    async def _request_once(
+            self,
+            method: str,
+            url: str,
+            payload: dict | None,
+            headers: dict
+    ) -> tuple[APIResponse, Mapping[str, str]]:
+        """
+        Send a single request through the shared pooled session when the adapter has an open
+        `HTTPSessionManager`, otherwise through a short-lived session created for this call.
+        """
+        if self._http_session_manager is not None and self._http_session_manager.is_open:
+            return await self._send(self._http_session_manager.session, method, url, payload, headers)
+
         async with aiohttp.ClientSession() as session:
-            async with session.request(method, full_url, json=payload, headers=full_headers) as response:
-                response_data = {"ok": False, "error": response.reason, "data": None, "status_code": response.status,
-                                 "message": None, "status_message": response.reason}
-                if response.ok:
-                    data = await response.json()
-                    response_data = {"ok": True, "data": data, "error": None, "status_code": response.status}
-                return APIResponse(**response_data)
+            return await self._send(session, method, url, payload, headers)
+
+    @staticmethod
+    async def _send(
+            session: aiohttp.ClientSession,
+            method: str,
+            url: str,
+            payload: dict | None,
+            headers: dict
+    ) -> tuple[APIResponse, Mapping[str, str]]:
+        """
+        Send the request through the given session and wrap the response.
+        """
+        async with session.request(method, url, json=payload, headers=headers) as response:
+            response_data = {"ok": False, "error": response.reason, "data": None, "status_code": response.status,
+                             "message": None, "status_message": response.reason}
+            if response.ok:
+                data = await response.json(loads=serialization.loads)
+                response_data = {"ok": True, "data": data, "error": None, "status_code": response.status}
+            return APIResponse(**response_data), response.headers
 
 
 class PhantomBusterAgentAdapter(PhantomBusterAdapterBase):
@@ -42,8 +126,15 @@ class PhantomBusterAgentAdapter(PhantomBusterAdapterBase):
     Adapter for the PhantomBuster Agent API.
     """
 
-    def __init__(self, api_key: str, base_url: str) -> None:
-        super().__init__(api_key, base_url)
+    def __init__(
+            self,
+            api_key: str,
+            base_url: str,
+            http_session_manager: HTTPSessionManager | None = None,
+            rate_limiter: TokenBucketRateLimiter | None = None,
+            retry_policy: RetryPolicy | None = None
+    ) -> None:
+        super().__init__(api_key, base_url, http_session_manager, rate_limiter, retry_policy)
 
     async def retrieve_agent(self, agent_id: str) -> APIResponse:
         """
@@ -65,8 +156,15 @@ class PhantomBusterContainerAdapter(PhantomBusterAdapterBase):
     Adapter for the PhantomBuster Container API.
     """
 
-    def __init__(self, api_key: str, base_url: str) -> None:
-        super().__init__(api_key, base_url)
+    def __init__(
+            self,
+            api_key: str,
+            base_url: str,
+            http_session_manager: HTTPSessionManager | None = None,
+            rate_limiter: TokenBucketRateLimiter | None = None,
+            retry_policy: RetryPolicy | None = None
+    ) -> None:
+        super().__init__(api_key, base_url, http_session_manager, rate_limiter, retry_policy)
 
     async def retrieve_container(self, container_id: str) -> APIResponse:
         """
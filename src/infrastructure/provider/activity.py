@@ -1,20 +1,34 @@
 """
 This module contains the implementation of the activity provider.
 """
-import json
+import asyncio
+import datetime
 import logging
+import time
+import typing as t
 
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import String, any_, bindparam, select
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import text
+from sqlalchemy.sql import Select
 
 from src.domain.entity import Activity
+from src.domain.entity.job import SyncProgress
 from src.domain.provider.activity import BaseActivityProvider
 from src.infrastructure.db.postgres.orm import activity as activity_orm
-from src.infrastructure.db.postgres.session import DatabaseSessionManager
+from src.infrastructure.db.postgres.orm import sync_checkpoint as sync_checkpoint_orm
+from src.infrastructure.db.postgres.session import DatabaseSessionManager, ScopedSession
 from src.infrastructure.external.phantombuster.adapter import PhantomBusterAgentAdapter, PhantomBusterContainerAdapter
 
 logger = logging.getLogger(__name__)
 
+# Status of a container whose result is complete. The result of a running container may be empty or partial.
+FINISHED_STATUS = "finished"
+
+# Validates a whole container result (a JSON array of posts) in a single pass inside pydantic-core.
+activity_list_adapter = TypeAdapter(list[Activity])
+
 
 class PhantomBusterWithPGActivityProvider(BaseActivityProvider):
     """
@@ -25,75 +39,265 @@ class PhantomBusterWithPGActivityProvider(BaseActivityProvider):
             self,
             phantombuster_agent_adapter: PhantomBusterAgentAdapter,
             phantombuster_container_adapter: PhantomBusterContainerAdapter,
-            session_manager: DatabaseSessionManager
+            session_manager: DatabaseSessionManager,
+            concurrency: int = 1
     ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be a positive integer")
         self.agent_adapter = phantombuster_agent_adapter
         self.container_adapter = phantombuster_container_adapter
         self.session_manager = session_manager
-        self.__session: AsyncSession
+        self.concurrency = concurrency
+        self.__sessions = ScopedSession(f"{type(self).__name__}.session")
+
+    @property
+    def __session(self) -> AsyncSession | None:
+        """
+        The session of the current request / task.
+        """
+        return self.__sessions.current
 
     async def __aenter__(self):
-        self.__session = self.session_manager.give_session()
+        self.__sessions.push(self.session_manager.give_session())
         print("Session opened in Repository.")
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        session = self.__sessions.pop()
         if exc_type is not None:
-            await self.__session.rollback()
+            await session.rollback()
             print("Session rollback in Provider.")
-        await self.__session.commit()
+        await session.commit()
         print("Session commit in Provider.")
-        await self.__session.close()
+        await session.close()
         print("Session closed in Provider.")
 
-    async def _get_processed_container_ids_per_agent(self) -> dict:
+    @staticmethod
+    def _container_order_key(container_id: str) -> tuple[int, str]:
         """
-        Get the processed container IDs per agent.
+        Order key of a container ID. PhantomBuster container IDs are growing numeric strings,
+        so comparing by length first gives the numeric order without casting.
         """
-        query = text(f"""
-            SELECT distinct agent_id, container_id
-            FROM {activity_orm.Activity.__tablename__}
-            WHERE agent_id IS NOT NULL
-        """)
-        result = await self.__session.execute(query)
-        return {row.container_id: row.agent_id for row in result}
+        container_id = str(container_id)
+        return len(container_id), container_id
 
-    async def sync(self) -> list[Activity]:
+    async def _get_checkpoints(self) -> dict[str, str]:
         """
-        Get activities with filters.
+        Get the last fully synced container ID per agent.
+        """
+        result = await self.__session.execute(
+            select(sync_checkpoint_orm.SyncCheckpoint.agent_id, sync_checkpoint_orm.SyncCheckpoint.last_container_id)
+        )
+        return {row.agent_id: row.last_container_id for row in result}
+
+    async def _get_stored_container_ids(self, container_ids: list[str]) -> set[str]:
+        """
+        Get which of the given containers already have stored activities.
+        Only the containers newer than the checkpoints are asked about.
+        """
+        if not container_ids:
+            return set()
+        result = await self.__session.execute(self._stored_container_ids_statement(container_ids))
+        return set(result.scalars())
+
+    @staticmethod
+    def _stored_container_ids_statement(container_ids: list[str]) -> Select:
+        """
+        Build the statement of `_get_stored_container_ids`.
+        """
+        return select(activity_orm.Activity.container_id).distinct().where(
+            activity_orm.Activity.container_id == any_(
+                bindparam("container_ids", value=container_ids, type_=postgresql.ARRAY(String))
+            )
+        )
+
+    async def _save_checkpoints(self, checkpoints: dict[str, str]) -> None:
+        """
+        Upsert the checkpoints. They are committed with the provider session on exit,
+        i.e. after the consumer has stored the synced activities.
+        """
+        if not checkpoints:
+            return
+        now = datetime.datetime.utcnow()
+        statement = postgresql.insert(sync_checkpoint_orm.SyncCheckpoint).values([
+            {"agent_id": agent_id, "last_container_id": container_id, "updated_at": now}
+            for agent_id, container_id in checkpoints.items()
+        ])
+        await self.__session.execute(statement.on_conflict_do_update(
+            index_elements=[sync_checkpoint_orm.SyncCheckpoint.agent_id],
+            set_={
+                "last_container_id": statement.excluded.last_container_id,
+                "updated_at": statement.excluded.updated_at,
+            }
+        ))
+
+    def _advance_checkpoints(self, containers: list[dict], done: set[str]) -> dict[str, str]:
+        """
+        Compute the new checkpoint per agent: the newest container before which every container is done.
+        A failed or unfinished container stops the checkpoint, so it is retried by the next sync.
+        """
+        checkpoints: dict[str, str] = {}
+        blocked: set[str] = set()
+        for container in sorted(containers, key=lambda c: self._container_order_key(c['id'])):
+            agent_id = container['agent_id']
+            if agent_id in blocked:
+                continue
+            if container['id'] not in done:
+                blocked.add(agent_id)
+                continue
+            checkpoints[agent_id] = container['id']
+        return checkpoints
+
+    async def _gather_bounded(self, coros: list) -> list:
+        """
+        Run the given coroutines concurrently, at most `self.concurrency` at a time.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(coro):
+            async with semaphore:
+                return await coro
+
+        return await asyncio.gather(*(run(coro) for coro in coros))
+
+    async def _list_agent_containers(self, agent_id: str) -> list[dict]:
+        """
+        List the containers of a single agent.
         """
+        api_response = await self.container_adapter.list_containers(agent_id=agent_id)
+        if not api_response.ok:
+            raise Exception(api_response.error)
+        return [{
+            "id": container.get('id'),
+            "agent_id": agent_id,
+            "status": container.get('status')
+        } for container in api_response.data.get('containers', [])]
+
+    async def _get_container_activities(self, container: dict) -> tuple[dict, list[Activity] | None]:
+        """
+        Fetch and parse the result of a single container.
+        Failures are logged and yield `None` instead of the activities, so one broken container
+        does not abort the sync.
+        """
+        try:
+            api_response = await self.container_adapter.get_result(container_id=container.get('id'))
+        except Exception as exc:
+            logger.error("Failed to fetch the result of container %s: %s", container.get('id'), exc)
+            return container, None
+        if not api_response.ok:
+            logger.error(api_response.error)
+            return container, None
+        results_json = api_response.data.get('resultObject', '[]') or '[]'
+        try:
+            activities = activity_list_adapter.validate_json(results_json)
+        except ValidationError as exc:
+            # Malformed JSON fails the validation as well.
+            logger.error("Failed to parse the result of container %s: %s", container.get('id'), exc)
+            return container, None
+        for activity in activities:
+            activity.agent_id = container.get('agent_id')
+            activity.container_id = container.get('id')
+        return container, activities
+
+    async def _iter_bounded(self, func: t.Callable[[t.Any], t.Awaitable[t.Any]], items: list) -> t.AsyncIterator:
+        """
+        Apply `func` to the items concurrently (at most `self.concurrency` at a time) and yield the results
+        as they complete. The buffer between the workers and the consumer is bounded as well, so a slow
+        consumer applies back-pressure to the fetching instead of letting results pile up in memory.
+        """
+        if not items:
+            return
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        pending = iter(items)
+
+        async def worker():
+            for item in pending:
+                try:
+                    await queue.put((await func(item), None))
+                except Exception as exc:
+                    await queue.put((None, exc))
+                    return
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, len(items)))]
+        try:
+            for _ in range(len(items)):
+                result, exc = await queue.get()
+                if exc is not None:
+                    raise exc
+                yield result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def stream(self, progress: SyncProgress | None = None) -> t.AsyncIterator[list[Activity]]:
+        """
+        Yield the activities of every new container as soon as its result is fetched.
+
+        Containers and their results are fetched concurrently, bounded by `self.concurrency`.
+        """
+        progress = progress or SyncProgress()
+        started_at = time.perf_counter()
         api_response = await self.agent_adapter.list_agents()
 
         if not api_response.ok:
             raise Exception(api_response.error)
 
         agents = api_response.data
-        containers: list[dict] = []
-
-        for agent in agents:
-            api_response = await self.container_adapter.list_containers(agent_id=agent.get('id'))
-            if not api_response.ok:
-                raise Exception(api_response.error)
-            containers.extend([{
-                "id": container.get('id'),
-                "agent_id": agent.get('id')
-            } for container in api_response.data.get('containers', [])])
-
-        processed_container_ids_per_agent = await self._get_processed_container_ids_per_agent()
-        new_containers = [container for container in containers if
-                          container.get('id') not in processed_container_ids_per_agent.keys()]
-
-        activities = []
-        for container in new_containers:
-            api_response = await self.container_adapter.get_result(container_id=container.get('id'))
-            if not api_response.ok:
-                logger.error(api_response.error)
+        agents_listed_at = time.perf_counter()
+
+        containers_per_agent = await self._gather_bounded(
+            [self._list_agent_containers(agent.get('id')) for agent in agents]
+        )
+        containers: list[dict] = [container for containers in containers_per_agent for container in containers]
+        progress.agents_scanned += len(agents)
+        containers_listed_at = time.perf_counter()
+
+        checkpoints = await self._get_checkpoints()
+        candidates = [
+            container for container in containers
+            if container['agent_id'] not in checkpoints or
+            self._container_order_key(container['id']) > self._container_order_key(checkpoints[container['agent_id']])
+        ]
+        stored_container_ids = await self._get_stored_container_ids([container['id'] for container in candidates])
+        # Ends the read transaction: its lock on the activities table would hold back the partitions the consumer
+        # may create meanwhile, until the end of the sync. The checkpoints are saved in a new one.
+        await self.__session.commit()
+        # The containers still running are left to a later sync, once their result is complete.
+        new_containers = [
+            container for container in candidates
+            if container['id'] not in stored_container_ids and container['status'] == FINISHED_STATUS
+        ]
+        processed_loaded_at = time.perf_counter()
+
+        activities_count = 0
+        done = set(stored_container_ids)
+        async for container, activities in self._iter_bounded(self._get_container_activities, new_containers):
+            if activities is None:
+                progress.errors += 1
                 continue
-            results_json = api_response.data.get('resultObject', '[]') or '[]'
-            results = json.loads(results_json)
-            activities.extend([
-                Activity(**activity, agent_id=container.get('agent_id'), container_id=container.get('id'))
-                for activity in results
-            ])
-
-        return activities
+            progress.containers_fetched += 1
+            done.add(container['id'])
+            activities_count += len(activities)
+            yield activities
+        results_fetched_at = time.perf_counter()
+
+        await self._save_checkpoints(self._advance_checkpoints(candidates, done))
+
+        logger.info(
+            "Sync finished: %d agents, %d containers (%d new), %d activities. "
+            "Timings: list_agents=%.3fs list_containers=%.3fs processed_lookup=%.3fs get_results=%.3fs total=%.3fs",
+            len(agents), len(containers), len(new_containers), activities_count,
+            agents_listed_at - started_at,
+            containers_listed_at - agents_listed_at,
+            processed_loaded_at - containers_listed_at,
+            results_fetched_at - processed_loaded_at,
+            results_fetched_at - started_at,
+        )
+
+    async def sync(self) -> list[Activity]:
+        """
+        Get activities with filters.
+        """
+        return [activity async for activities in self.stream() for activity in activities]
@@ -1,26 +1,48 @@
 """
 This module contains the implementation of the activity provider.
 """
+import asyncio
+import datetime
 import logging
-from typing import List
+import pickle
+from typing import Callable, List, TypeVar
 
 import pandas as pd
+from sqlalchemy import case, distinct, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 
-from src.domain.entity import Activity
+from src.domain.entity import Activity, ActivityFilter
 from src.domain.entity.analytics.model import AnalyticsReport
+from src.domain.entity.analytics.rollup import AnalyticsMonthlyRollup, report_from_rollups
 from src.domain.provider.analytics import BaseAnalyticsReportProvider
-import emoji
+from src.infrastructure.db.postgres.orm import activity as activity_orm
+from src.infrastructure.db.postgres.orm import analytics_rollup as rollup_orm
+from src.infrastructure.db.postgres.orm import profile as profile_orm
+from src.infrastructure.db.postgres.session import DatabaseSessionManager, ScopedSession
+from src.infrastructure.repository.activity.postgres import READER_FAILURES, where
+from src.infrastructure.runner.executor import ExecutorManager
+from src.utils import text
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class CustomFromDFAnalyticsReportProvider(BaseAnalyticsReportProvider):
     """
     Provider for the activity entity.
     """
 
-    def __init__(self):
-        ...
+    required_fields = ("post_content", "post_timestamp", "like_count", "comment_count", "img_url", "video_url")
+
+    # Activities serialized at a time for a worker process. Serializing holds the GIL, so it is done in a thread
+    # by small chunks, between which the event loop gets to run.
+    transfer_chunk_size = 2000
+
+    def __init__(self, executor: ExecutorManager | None = None):
+        # The report is computed in the executor pool if any, so it does not block the event loop.
+        self.executor = executor
 
     async def __aenter__(self):
         return self
@@ -31,31 +53,272 @@ class CustomFromDFAnalyticsReportProvider(BaseAnalyticsReportProvider):
     async def generate_report(self, activities: List[Activity]) -> AnalyticsReport:
         """
         Generate the analytics report.
+        Raises ValueError if there are no activities.
+        """
+        if not activities:
+            raise ValueError("No activities match the report filters")
+        if self.executor is None:
+            return compute_report(self.to_columns(activities))
+        if self.executor.kind == "process":
+            chunks = await asyncio.to_thread(self.dump_columns, activities)
+            return await self.executor.run(compute_dumped_report, chunks)
+        return await self.executor.run(lambda: compute_report(self.to_columns(activities)))
+
+    async def _compute(self, func: Callable[..., T], *args) -> T:
+        """
+        Run the CPU-bound `func(*args)` in the executor pool, or inline if there is none.
+        """
+        if self.executor is None:
+            return func(*args)
+        return await self.executor.run(func, *args)
+
+    @classmethod
+    def to_columns(cls, activities: List[Activity]) -> dict[str, list]:
+        """
+        Extract the required fields of the activities, column by column.
+        """
+        return {field: [getattr(activity, field) for activity in activities] for field in cls.required_fields}
+
+    @classmethod
+    def dump_columns(cls, activities: List[Activity]) -> list[bytes]:
+        """
+        Pickle the columns of the activities, `transfer_chunk_size` activities at a time.
+        """
+        return [
+            pickle.dumps(cls.to_columns(activities[start:start + cls.transfer_chunk_size]))
+            for start in range(0, len(activities), cls.transfer_chunk_size)
+        ]
+
+
+def compute_report(columns: dict[str, list]) -> AnalyticsReport:
+    """
+    Compute the analytics report of the activity columns (see `CustomFromDFAnalyticsReportProvider.to_columns`).
+    Defined at module level, so it can be run in a worker process.
+    """
+    df = pd.DataFrame(columns)
+    average_text_length = df["post_content"].str.len().mean()
+    average_postings_per_month = df["post_timestamp"].dt.to_period("M").value_counts().mean()
+    average_emoji = count_emojis(df["post_content"]).mean()
+    average_likes = df["like_count"].mean()
+    average_comments = df["comment_count"].mean()
+    average_paragraphs = df["post_content"].str.count("\n").mean()
+    average_hashtags = df["post_content"].str.count("#").mean()
+
+    # if post contains img_url or video_url, it is considered as visual (+1) else not visual (0)
+    percentage_visuals_used = (df["img_url"].notnull() | df["video_url"].notnull()).sum() / df.shape[0]
+
+    return AnalyticsReport(
+        start_date=columns["post_timestamp"][0],
+        end_date=columns["post_timestamp"][-1],
+        average_text_length=average_text_length,
+        average_postings_per_month=average_postings_per_month,
+        average_headline_length=0,
+        average_emojis=average_emoji,
+        average_likes=average_likes,
+        average_comments=average_comments,
+        average_paragraphs=average_paragraphs,
+        average_hashtags=average_hashtags,
+        percentage_visuals_used=percentage_visuals_used
+    )
+
+
+def compute_dumped_report(chunks: list[bytes]) -> AnalyticsReport:
+    """
+    Compute the analytics report of the activity columns pickled by `CustomFromDFAnalyticsReportProvider.dump_columns`.
+    """
+    columns: dict[str, list] = {}
+    for chunk in chunks:
+        for field, values in pickle.loads(chunk).items():
+            columns.setdefault(field, []).extend(values)
+    return compute_report(columns)
+
+
+def count_emojis(contents: pd.Series) -> pd.Series:
+    """
+    Count the emojis of every post content, as `emoji.emoji_count` does.
+    The runs of emoji characters are found in bulk with the precompiled regex, and only the distinct runs
+    are tokenized by `emoji`, so the cost mostly depends on the regex scan of the contents.
+    """
+    runs = contents.str.findall(text.EMOJI_RUN).explode().dropna()
+    counts = runs.map({run: text.count_emoji_run(run) for run in runs.unique()})
+    return counts.groupby(level=0).sum().reindex(contents.index, fill_value=0).astype(int)
+
+
+def sum_emojis(contents: List[str | None]) -> int:
+    """
+    Count the emojis of the post contents altogether. Defined at module level, so it can be run in a worker process.
+    """
+    return sum(map(text.count_emojis, contents))
+
+
+# Filters a report can be summed up from the monthly rollups with (the bounds have to be month starts).
+ROLLUP_FILTERS = {"profile_url", "post_timestamp_from", "post_timestamp_to"}
+
+
+def is_month_start(value: datetime.datetime) -> bool:
+    return value == datetime.datetime(value.year, value.month, 1)
+
+
+def count_char(column, char: str):
+    """
+    SQL expression of the number of occurrences of a single character in a text column.
+    """
+    return func.char_length(column) - func.char_length(func.replace(column, char, ""))
+
+
+class PostgresAggregateAnalyticsReportProvider(CustomFromDFAnalyticsReportProvider):
+    """
+    Provider of the analytics report computed by Postgres, with a single aggregate query: only the aggregates
+    are sent back instead of the activities. It computes the same figures as `CustomFromDFAnalyticsReportProvider`,
+    which it falls back to when it is given already loaded activities.
+
+    Emojis cannot be told apart in SQL the way the `emoji` package does, so they are counted in Python
+    over a stream of the post contents alone, unless `count_emojis` is False (the average is 0 then).
+
+    With `use_rollups`, a report over whole months of a profile is summed up from its monthly rollups instead,
+    as long as they cover all its activities (i.e. once they have been backfilled).
+
+    The queries run on a read replica when the session manager has any,
+    and fail over to the primary if the replica is unavailable.
+    """
+
+    def __init__(self, session_manager: DatabaseSessionManager, count_emojis: bool = True, batch_size: int = 1000,
+                 use_rollups: bool = True, executor: ExecutorManager | None = None):
+        super().__init__(executor=executor)
+        self.session_manager = session_manager
+        self.count_emojis = count_emojis
+        self.batch_size = batch_size
+        self.use_rollups = use_rollups
+        self.__sessions = ScopedSession(f"{type(self).__name__}.session")
+        self.__read_sessions = ScopedSession(f"{type(self).__name__}.read_session")
+
+    @property
+    def __session(self) -> AsyncSession | None:
+        """
+        The session of the current request / task.
+        """
+        return self.__sessions.current
+
+    async def __aenter__(self):
+        self.__sessions.push(self.session_manager.give_session())
+        self.__read_sessions.push(self.session_manager.give_read_session())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        read_session = self.__read_sessions.pop()
+        if read_session is not None:
+            await read_session.close()
+        session = self.__sessions.pop()
+        await session.rollback()
+        await session.close()
+
+    async def __read(self, statement: Select, stream: bool = False):
         """
-        df = pd.DataFrame([activity.dict() for activity in activities])
-        average_text_length = df["post_content"].apply(len).mean()
-        average_postings_per_month = df["post_timestamp"].dt.to_period("M").value_counts().mean()
-        average_emoji = df["post_content"].apply(lambda x: emoji.emoji_count(x)).mean()
-        average_likes = df["like_count"].mean()
-        average_comments = df["comment_count"].mean()
-        average_paragraphs = df["post_content"].apply(lambda x: x.count("\n")).mean()
-        average_hashtags = df["post_content"].apply(lambda x: x.count("#")).mean()
+        Execute a query on the read replica of the current scope (the primary if there is none).
+        If the replica fails, it is reported to the session manager and the rest of the scope reads from the primary.
+        """
+        read_session = self.__read_sessions.current
+        if read_session is not None:
+            try:
+                return await (read_session.stream if stream else read_session.execute)(statement)
+            except READER_FAILURES as exc:
+                logger.warning("Read replica failed (%r), failing over to the primary.", exc)
+                self.session_manager.mark_reader_down(read_session)
+                self.__read_sessions.replace(None)
+                await read_session.close()
+        return await (self.__session.stream if stream else self.__session.execute)(statement)
 
-        # if post contains img_url or video_url, it is considered as visual (+1) else not visual (0)
-        percentage_visuals_used = (df["img_url"].notnull() | df["video_url"].notnull()).sum() / df.shape[0]
+    async def query_report(self, filters: ActivityFilter) -> AnalyticsReport:
+        """
+        Compute the report of the activities matching the filters in Postgres.
+        """
+        if self.use_rollups:
+            report = await self.__rollup_report(filters)
+            if report is not None:
+                return report
+
+        row = (await self.__read(self._aggregate_statement(filters))).mappings().one()
+        if not row["count"]:
+            raise ValueError("No activities match the report filters")
 
+        average_emojis = 0.0
+        if self.count_emojis:
+            average_emojis = await self.__count_emojis(filters) / row["count"]
 
-        df.sort_values(by="post_timestamp", inplace=True)
         return AnalyticsReport(
-            start_date=activities[0].post_timestamp,
-            end_date=activities[-1].post_timestamp,
-            average_text_length=average_text_length,
-            average_postings_per_month=average_postings_per_month,
+            start_date=row["start_date"],
+            end_date=row["end_date"],
+            average_text_length=float(row["average_text_length"]),
+            average_postings_per_month=row["count"] / row["months"],
             average_headline_length=0,
-            average_emojis=average_emoji,
-            average_likes=average_likes,
-            average_comments=average_comments,
-            average_paragraphs=average_paragraphs,
-            average_hashtags=average_hashtags,
-            percentage_visuals_used=percentage_visuals_used
+            average_emojis=average_emojis,
+            average_likes=float(row["average_likes"]),
+            average_comments=float(row["average_comments"]),
+            average_paragraphs=float(row["average_paragraphs"]),
+            average_hashtags=float(row["average_hashtags"]),
+            percentage_visuals_used=float(row["percentage_visuals_used"]),
         )
+
+    async def __rollup_report(self, filters: ActivityFilter) -> AnalyticsReport | None:
+        """
+        Compute the report from the monthly rollups, or return None if the filters do not select whole months
+        of a single profile, or if the rollups do not cover all the activities of the profile.
+        """
+        set_filters = filters.model_dump(exclude_unset=True, exclude_defaults=True)
+        if "profile_url" not in set_filters or set(set_filters) - ROLLUP_FILTERS:
+            return None
+        start, end = set_filters.get("post_timestamp_from"), set_filters.get("post_timestamp_to")
+        if not all(map(is_month_start, filter(None, (start, end)))):
+            return None
+
+        rollup_table = rollup_orm.AnalyticsMonthlyRollup
+        rows = (await self.__read(
+            select(rollup_table).where(rollup_table.profile_url == filters.profile_url)
+        )).scalars().all()
+        activity_count = (await self.__read(
+            select(profile_orm.Profile.activity_count).where(profile_orm.Profile.profile_url == filters.profile_url)
+        )).scalar()
+        if activity_count is None or sum(row.post_count for row in rows) != activity_count:
+            logger.info("The rollups of %s are incomplete, aggregating its activities instead.", filters.profile_url)
+            return None
+
+        return report_from_rollups([
+            AnalyticsMonthlyRollup.model_validate(row, from_attributes=True) for row in rows
+            if (start is None or row.month >= start.date()) and (end is None or row.month < end.date())
+        ])
+
+    async def __count_emojis(self, filters: ActivityFilter) -> int:
+        """
+        Count the emojis of the post contents, streamed `self.batch_size` rows at a time
+        (every batch is counted in the executor pool, if any).
+        """
+        statement = select(activity_orm.Activity.post_content).where(*where(filters)).execution_options(
+            yield_per=self.batch_size)
+        result = await self.__read(statement, stream=True)
+        count = 0
+        try:
+            async for contents in result.scalars().partitions(self.batch_size):
+                count += await self._compute(sum_emojis, contents)
+        finally:
+            await result.close()
+        return count
+
+    @staticmethod
+    def _aggregate_statement(filters: ActivityFilter) -> Select:
+        """
+        Build the aggregate query of `query_report`.
+        """
+        activity = activity_orm.Activity
+        is_visual = case((activity.img_url.is_not(None) | activity.video_url.is_not(None), 1), else_=0)
+        return select(
+            func.count().label("count"),
+            func.min(activity.post_timestamp).label("start_date"),
+            func.max(activity.post_timestamp).label("end_date"),
+            func.count(distinct(func.date_trunc("month", activity.post_timestamp))).label("months"),
+            func.avg(func.char_length(activity.post_content)).label("average_text_length"),
+            func.avg(activity.like_count).label("average_likes"),
+            func.avg(activity.comment_count).label("average_comments"),
+            func.avg(count_char(activity.post_content, "\n")).label("average_paragraphs"),
+            func.avg(count_char(activity.post_content, "#")).label("average_hashtags"),
+            func.avg(is_visual).label("percentage_visuals_used"),
+        ).where(*where(filters))
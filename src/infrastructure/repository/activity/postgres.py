@@ -1,39 +1,189 @@
 """
 This module contains the repository for the activity entity.
 """
+import base64
+import datetime
+import json
+import logging
+import operator
 import typing as t
-from src.domain.entity import ActivityFilter, Activity
+from src.domain.entity import ActivityFilter, Activity, ActivityPage
+from src.domain.entity.analytics.rollup import AnalyticsMonthlyRollup
+from src.domain.entity.profile import Profile
 from src.domain.repository.activity import BaseActivityRepository
+from sqlalchemy import delete, func, literal_column, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import InterfaceError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.sql import Select
 from src.infrastructure.db.postgres.orm import activity as activity_orm
-from src.infrastructure.db.postgres.session import DatabaseSessionManager
+from src.infrastructure.db.postgres.orm import analytics_rollup as rollup_orm
+from src.infrastructure.db.postgres.orm import profile as profile_orm
+from src.infrastructure.db.postgres.partition import creation_horizon, ensure_partitions, list_partitions, month_start
+from src.infrastructure.db.postgres.session import DatabaseSessionManager, ScopedSession
 from src.utils.decorators import with_pre_post_action
 
+logger = logging.getLogger(__name__)
+
+IngestMode = t.Literal["copy", "insert", "orm"]
+
+# Errors of a read replica that make the read fail over to the primary.
+READER_FAILURES = (OperationalError, InterfaceError, OSError)
+
+# Entity fields written by the bulk ingest, in the column order of the COPY / INSERT.
+INGEST_COLUMNS: t.Tuple[str, ...] = tuple(Activity.model_fields)
+STAGING_TABLE = f"{activity_orm.Activity.__tablename__}_staging"
+# How long the creation of a partition may wait for its lock on the activities table: the reads queue up behind it.
+PARTITION_LOCK_TIMEOUT = "5s"
+# Identifies the inserted rows among a batch: the whole natural key, as rows sharing all but the post timestamp
+# are distinct activities (post_timestamp is naive on both sides, so it comes back from the database as sent).
+INSERTED_KEY: t.Tuple[str, ...] = activity_orm.Activity.natural_key
+inserted_key = operator.attrgetter(*INSERTED_KEY)
+# Activity fields the monthly rollups are computed from.
+ROLLUP_COLUMNS: t.Tuple[str, ...] = (
+    "profile_url", "post_timestamp", "post_content", "like_count", "comment_count", "img_url", "video_url",
+)
+
+
+def to_entity(row: t.Mapping[str, t.Any]) -> Activity:
+    """
+    Build an entity from a row we wrote ourselves, skipping the validation (trusted fast path).
+    The fields that are not in the row (not projected) are set to None.
+    """
+    return Activity.model_construct(**(dict.fromkeys(INGEST_COLUMNS) | {
+        column: row[column] for column in INGEST_COLUMNS if column in row
+    }))
+
+
+def project(columns: t.Sequence[str] | None = None) -> t.List[t.Any]:
+    """
+    Map entity field names to the table columns, all of them by default.
+    """
+    columns = INGEST_COLUMNS if columns is None else columns
+    unknown = set(columns) - set(INGEST_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown activity columns: {', '.join(sorted(unknown))}")
+    return [getattr(activity_orm.Activity, column) for column in columns]
+
+
+# Comparison of the range predicates of the filters, by the suffix of their name (e.g. `like_count_min`).
+RANGE_OPERATORS: t.Dict[str, t.Callable[[t.Any, t.Any], t.Any]] = {
+    "from": operator.ge,
+    "to": operator.lt,
+    "min": operator.ge,
+    "max": operator.le,
+}
+
+
+def where(filters: ActivityFilter) -> t.List[t.Any]:
+    """
+    Translate the set filters into SQL predicates: equality on a column, or a range bound of one.
+    """
+    predicates = []
+    for field, value in filters.model_dump(exclude_unset=True, exclude_defaults=True).items():
+        column, _, suffix = field.rpartition("_")
+        if not hasattr(activity_orm.Activity, field) and suffix in RANGE_OPERATORS:
+            predicates.append(RANGE_OPERATORS[suffix](getattr(activity_orm.Activity, column), value))
+        else:
+            predicates.append(getattr(activity_orm.Activity, field) == value)
+    return predicates
+
+
+def encode_cursor(post_timestamp: datetime.datetime, activity_id: int, rank: float | None = None) -> str:
+    """
+    Encode the keyset position (post_timestamp, id) of a row into an opaque cursor.
+    The search rank of the row is part of the position of a ranked (search) page.
+    """
+    position = [post_timestamp.isoformat(), activity_id] + ([rank] if rank is not None else [])
+    payload = json.dumps(position).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_cursor(cursor: str) -> t.Tuple[datetime.datetime, int, float | None]:
+    """
+    Decode a cursor made by `encode_cursor`. Raises ValueError if it is malformed.
+    """
+    try:
+        post_timestamp, activity_id, *rank = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(rank) > 1:
+            raise ValueError
+        return (datetime.datetime.fromisoformat(post_timestamp), int(activity_id),
+                float(rank[0]) if rank else None)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
 
 class ActivityRepository(BaseActivityRepository):
     """
     Repository for the activity entity.
+
+    `ingest_mode` selects how `bulk_create` writes the rows:
+      - "copy": the asyncpg COPY protocol into a staging table, merged with `INSERT ... ON CONFLICT DO NOTHING`
+        (falls back to "insert" on other drivers),
+      - "insert": batched multi-row `INSERT ... ON CONFLICT DO NOTHING` via executemany,
+      - "orm": ORM instances flushed by the unit of work. It is not idempotent (a duplicate fails the
+        natural-key constraint) and is kept as a baseline for the benchmarks.
+
+    The read-only methods run on a read replica when the session manager has any,
+    and fail over to the primary if the replica is unavailable.
+
+    The table is partitioned by month of post_timestamp; `bulk_create` creates the missing partitions
+    of the months it writes to (old posts of a newly synced profile may predate the existing ones),
+    except below the retention horizon of `retain_months` and of the archived partitions.
+    The upcoming months are created ahead by the maintenance command (see `partition.maintain`).
     """
 
-    def __init__(self, session_manager: DatabaseSessionManager):
+    def __init__(self, session_manager: DatabaseSessionManager, ingest_mode: IngestMode = "copy",
+                 retain_months: int | None = None):
         self.session_manager = session_manager
-        self.__session: AsyncSession
+        self.ingest_mode = ingest_mode
+        self.retain_months = retain_months
+        self.__sessions = ScopedSession(f"{type(self).__name__}.session")
+        self.__read_sessions = ScopedSession(f"{type(self).__name__}.read_session")
+
+    @property
+    def __session(self) -> AsyncSession | None:
+        """
+        The session of the current request / task.
+        """
+        return self.__sessions.current
 
     async def __aenter__(self):
-        self.__session = self.session_manager.give_session()
+        self.__sessions.push(self.session_manager.give_session())
+        self.__read_sessions.push(self.session_manager.give_read_session())
         print("Session opened in Repository.")
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        read_session = self.__read_sessions.pop()
+        if read_session is not None:
+            await read_session.close()
+        session = self.__sessions.pop()
         if exc_type is not None:
-            await self.__session.rollback()
+            await session.rollback()
             print("Session rollback in Repository.")
-        await self.__session.commit()
+        await session.commit()
         print("Session commit in Repository.")
-        await self.__session.close()
+        await session.close()
         print("Session closed in Repository.")
 
+    async def __read(self, statement: Select, stream: bool = False) -> t.Any:
+        """
+        Execute a read-only statement on the read replica of the current scope (the primary if there is none).
+        If the replica fails, it is reported to the session manager and the rest of the scope reads from the primary.
+        """
+        read_session = self.__read_sessions.current
+        if read_session is not None:
+            try:
+                return await (read_session.stream if stream else read_session.execute)(statement)
+            except READER_FAILURES as exc:
+                logger.warning("Read replica failed (%r), failing over to the primary.", exc)
+                self.session_manager.mark_reader_down(read_session)
+                self.__read_sessions.replace(None)
+                await read_session.close()
+        return await (self.__session.stream if stream else self.__session.execute)(statement)
+
     @with_pre_post_action('pre_action', 'post_action')
     async def create(self, activity: Activity) -> Activity:
         """
@@ -46,44 +196,300 @@ class ActivityRepository(BaseActivityRepository):
     @with_pre_post_action('pre_action', 'post_action')
     async def bulk_create(self, activities: t.List[Activity]) -> t.List[Activity]:
         """
-        Bulk create activities.
+        Bulk create activities, and update the profiles and the monthly rollups with the ones actually inserted.
+        Returns the inserted activities (the already stored ones, and the ones older than the retention horizon
+        of the partitions, are skipped).
         """
-        orm_objs = [activity_orm.Activity(**activity.model_dump()) for activity in activities]
-        self.__session.add_all(orm_objs)
+        if not activities:
+            return activities
+        profile_urls = {activity.profile_url for activity in activities}
+        # A duplicate within the batch is inserted once, so it must be counted once in the profiles and rollups.
+        activities = list({inserted_key(activity): activity for activity in activities}.values())
+        activities = await self.__ensure_partitions(activities)
+        if not activities:
+            inserted = []
+        elif self.ingest_mode == "orm":
+            orm_objs = [activity_orm.Activity(**activity.model_dump()) for activity in activities]
+            self.__session.add_all(orm_objs)
+            inserted = activities
+        else:
+            if self.ingest_mode == "insert" or (inserted_keys := await self.__copy(activities)) is None:
+                result = await self.__session.execute(
+                    insert(activity_orm.Activity).on_conflict_do_nothing(
+                        index_elements=activity_orm.Activity.natural_key
+                    ).returning(*(getattr(activity_orm.Activity, column) for column in INSERTED_KEY)),
+                    [dict(zip(INGEST_COLUMNS, row)) for row in self.__records(activities)]
+                )
+                inserted_keys = set(map(tuple, result.all()))
+            inserted = [activity for activity in activities if inserted_key(activity) in inserted_keys]
+        await self.__update_profiles(profile_urls, inserted)
+        await self.__update_rollups(inserted)
         print("Bulk create called in Repository.")
-        return activities
+        return inserted
+
+    async def __update_profiles(self, profile_urls: t.Set[str], inserted: t.List[Activity]) -> None:
+        """
+        Add the inserted activities to the counters of their profiles, and mark every synced profile
+        (including those whose activities were all already stored) as synced now.
+        """
+        counters = {profile_url: [0, None, None] for profile_url in profile_urls}
+        for activity in inserted:
+            counter = counters.setdefault(activity.profile_url, [0, None, None])
+            counter[0] += 1
+            counter[1] = activity.post_timestamp if counter[1] is None else min(counter[1], activity.post_timestamp)
+            counter[2] = activity.post_timestamp if counter[2] is None else max(counter[2], activity.post_timestamp)
+
+        now = datetime.datetime.utcnow()
+        statement = insert(profile_orm.Profile).values([
+            {
+                "profile_url": profile_url,
+                "activity_count": count,
+                "first_post_timestamp": first_post_timestamp,
+                "last_post_timestamp": last_post_timestamp,
+                "last_synced_at": now,
+            }
+            for profile_url, (count, first_post_timestamp, last_post_timestamp) in sorted(counters.items())
+        ])
+        # Sorted, so concurrent batches lock the profile rows in the same order.
+        # LEAST / GREATEST ignore NULLs, so a profile without new activities keeps its timestamps.
+        await self.__session.execute(statement.on_conflict_do_update(
+            index_elements=[profile_orm.Profile.profile_url],
+            set_={
+                "activity_count": profile_orm.Profile.activity_count + statement.excluded.activity_count,
+                "first_post_timestamp": func.least(
+                    profile_orm.Profile.first_post_timestamp, statement.excluded.first_post_timestamp),
+                "last_post_timestamp": func.greatest(
+                    profile_orm.Profile.last_post_timestamp, statement.excluded.last_post_timestamp),
+                "last_synced_at": statement.excluded.last_synced_at,
+            }
+        ))
+
+    async def __update_rollups(self, inserted: t.List[Activity]) -> None:
+        """
+        Add the inserted activities to the monthly rollups of their profiles.
+        """
+        rollups = AnalyticsMonthlyRollup.from_activities(inserted)
+        if not rollups:
+            return
+        rollup_table = rollup_orm.AnalyticsMonthlyRollup
+        statement = insert(rollup_table).values([rollup.model_dump() for rollup in rollups])
+        await self.__session.execute(statement.on_conflict_do_update(
+            index_elements=[rollup_table.profile_url, rollup_table.month],
+            set_={
+                **{column: getattr(rollup_table, column) + getattr(statement.excluded, column)
+                   for column in rollup_table.sums},
+                "first_post_timestamp": func.least(
+                    rollup_table.first_post_timestamp, statement.excluded.first_post_timestamp),
+                "last_post_timestamp": func.greatest(
+                    rollup_table.last_post_timestamp, statement.excluded.last_post_timestamp),
+            }
+        ))
+
+    @with_pre_post_action('pre_action', 'post_action')
+    async def rebuild_rollups(self, batch_size: int = 1000) -> int:
+        """
+        Recompute the monthly rollups of every profile from the stored activities.
+        The rollup table is locked first, so the ingests running meanwhile wait for the rebuild
+        instead of being lost or counted twice. Returns the number of rollups.
+        """
+        rollup_table = rollup_orm.AnalyticsMonthlyRollup
+        await self.__session.execute(text(f"LOCK TABLE {rollup_table.__tablename__} IN EXCLUSIVE MODE"))
+
+        rollups: t.Dict[t.Tuple[str, datetime.date], AnalyticsMonthlyRollup] = {}
+        statement = self._list_statement(ActivityFilter(), columns=ROLLUP_COLUMNS).execution_options(
+            yield_per=batch_size)
+        result = await self.__session.stream(statement)
+        try:
+            async for rows in result.mappings().partitions(batch_size):
+                for rollup in AnalyticsMonthlyRollup.from_activities(to_entity(row) for row in rows):
+                    key = (rollup.profile_url, rollup.month)
+                    if key in rollups:
+                        rollups[key] = rollups[key].merge(rollup)
+                    else:
+                        rollups[key] = rollup
+        finally:
+            await result.close()
+
+        await self.__session.execute(delete(rollup_table))
+        values = [rollup.model_dump() for rollup in rollups.values()]
+        for index in range(0, len(values), batch_size):
+            await self.__session.execute(insert(rollup_table), values[index:index + batch_size])
+        return len(values)
+
+    async def __ensure_partitions(self, activities: t.List[Activity]) -> t.List[Activity]:
+        """
+        Create the missing partitions of the months of the activities, and return the activities to store.
+        Creating a partition locks the whole activities table, so it is done in its own short transaction,
+        committed right away rather than with the batch; it is skipped when every month is attached already.
+        The activities of a missing month older than the creation horizon are skipped, since a fresh partition
+        of an archived month would not dedupe them against the archived rows.
+        """
+        table = activity_orm.Activity.__tablename__
+        missing = {month_start(activity.post_timestamp) for activity in activities} - set(
+            await list_partitions(self.__session, table))
+        if not missing:
+            return activities
+
+        async with self.session_manager.connect() as connection:
+            horizon = await creation_horizon(connection, table, self.retain_months)
+            skipped = {month for month in missing if horizon is not None and month < horizon}
+            await connection.execute(text(f"SET LOCAL lock_timeout = '{PARTITION_LOCK_TIMEOUT}'"))
+            await ensure_partitions(connection, table, missing - skipped)
+        if not skipped:
+            return activities
+        kept = [activity for activity in activities if month_start(activity.post_timestamp) not in skipped]
+        logger.warning("Skipping %d activities posted before %s, the retention horizon of the partitions.",
+                       len(activities) - len(kept), horizon)
+        return kept
+
+    @staticmethod
+    def __records(activities: t.Iterable[Activity]) -> t.Iterator[t.Tuple[t.Any, ...]]:
+        """
+        Stream the column values straight from the entities, without building ORM instances.
+        """
+        return map(operator.attrgetter(*INGEST_COLUMNS), activities)
+
+    async def __copy(self, activities: t.List[Activity]) -> t.Set[t.Tuple[str, ...]] | None:
+        """
+        Write the activities with the COPY protocol inside the session's transaction.
+        COPY cannot skip conflicting rows, so the rows are copied into a temporary staging table first
+        and then merged into the activities table, ignoring the already stored natural keys.
+        Returns the keys (see `inserted_key`) of the inserted rows, or None if the underlying driver is not asyncpg.
+        """
+        connection = await self.__session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        if not hasattr(driver_connection, "copy_records_to_table"):
+            return None
+        columns = ", ".join(f'"{column}"' for column in INGEST_COLUMNS)
+        await driver_connection.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} ON COMMIT DELETE ROWS AS "
+            f"SELECT {columns} FROM {activity_orm.Activity.__tablename__} WITH NO DATA"
+        )
+        await driver_connection.copy_records_to_table(
+            STAGING_TABLE,
+            records=self.__records(activities),
+            columns=INGEST_COLUMNS,
+        )
+        inserted = await driver_connection.fetch(
+            f"INSERT INTO {activity_orm.Activity.__tablename__} ({columns}) "
+            f"SELECT {columns} FROM {STAGING_TABLE} "
+            f"ON CONFLICT ({', '.join(activity_orm.Activity.natural_key)}) DO NOTHING "
+            f"RETURNING {', '.join(INSERTED_KEY)}"
+        )
+        await driver_connection.execute(f"TRUNCATE {STAGING_TABLE}")
+        return set(map(tuple, inserted))
 
     @with_pre_post_action('pre_action', 'post_action')
     async def get(self, activity_id: int | str) -> Activity:
         """
         Get an activity by its ID.
         """
-        orm_obj = await self.__session.get(activity_orm.Activity, activity_id)
-        entity = Activity.from_orm(orm_obj)
-        return entity
+        result = await self.__read(
+            select(*project()).where(activity_orm.Activity.id == int(activity_id))
+        )
+        row = result.mappings().one()
+        return to_entity(row)
 
     @with_pre_post_action('pre_action', 'post_action')
-    async def list(self, filters: ActivityFilter, limit: int = None, offset: int = None) -> t.List[Activity]:
+    async def list(self, filters: ActivityFilter, limit: int = None, offset: int = None,
+                   columns: t.Sequence[str] | None = None) -> t.List[Activity]:
         """
         List activities by filters.
+        Only the `columns` are read (all by default); the rest of the entity fields are None.
         """
-        orm_list = await self.__session.execute(
-            select(activity_orm.Activity).filter_by(
-                **filters.model_dump(exclude_unset=True, exclude_defaults=True)).offset(offset).limit(limit)
-        )
+        result = await self.__read(self._list_statement(filters, limit, offset, columns))
+        return [to_entity(row) for row in result.mappings()]
 
-        entities = [Activity.from_orm(orm_obj) for orm_obj in orm_list.scalars()]
-        return entities
+    async def stream(self, filters: ActivityFilter, batch_size: int = 1000,
+                     columns: t.Sequence[str] | None = None) -> t.AsyncIterator[t.List[Activity]]:
+        """
+        Stream activities by filters through a server-side cursor, `batch_size` rows at a time.
+        """
+        await self.pre_action(filters)
+        statement = self._list_statement(filters, columns=columns).execution_options(yield_per=batch_size)
+        result = await self.__read(statement, stream=True)
+        try:
+            async for rows in result.mappings().partitions(batch_size):
+                yield [to_entity(row) for row in rows]
+        finally:
+            await result.close()
 
     @with_pre_post_action('pre_action', 'post_action')
-    async def list_distinct_profiles(self) -> t.List[str]:
+    async def list_page(self, filters: ActivityFilter, limit: int, offset: int = 0,
+                        cursor: str | None = None, search: str | None = None) -> ActivityPage:
         """
-        Get distinct profiles.
+        List a page of activities, newest first, by keyset on (post_timestamp, id).
+        With `search`, only the activities whose post content matches it are listed, best ranked first.
         """
-        orm_list = await self.__session.execute(
-            select(activity_orm.Activity.profile_url).distinct()
-        )
-        return [orm_obj for orm_obj in orm_list.scalars()]
+        statement = self._page_statement(filters, limit, offset, cursor, search)
+        rows = (await self.__read(statement)).mappings().all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["post_timestamp"], rows[-1]["id"], rows[-1].get("rank"))
+        return ActivityPage.model_construct(items=[to_entity(row) for row in rows], next_cursor=next_cursor)
+
+    @with_pre_post_action('pre_action', 'post_action')
+    async def list_profiles(self, limit: int = None, offset: int = None) -> t.List[Profile]:
+        """
+        List the profiles with their counters, from the maintained profiles table.
+        """
+        result = await self.__read(self._profiles_statement(limit, offset))
+        return [Profile.model_construct(**row) for row in result.mappings()]
+
+    @staticmethod
+    def _list_statement(filters: ActivityFilter, limit: int = None, offset: int = None,
+                        columns: t.Sequence[str] | None = None) -> Select:
+        """
+        Build the statement of `list`.
+        """
+        return select(*project(columns)).where(*where(filters)).offset(offset).limit(limit)
+
+    @staticmethod
+    def _page_statement(filters: ActivityFilter, limit: int, offset: int = 0, cursor: str | None = None,
+                        search: str | None = None) -> Select:
+        """
+        Build the statement of `list_page`. One extra row is fetched to tell whether there is a next page.
+        The search matches through the GIN index of the post content tsvector; the matches are then ranked.
+        """
+        keyset = [activity_orm.Activity.post_timestamp, activity_orm.Activity.id]
+        statement = select(*project(), activity_orm.Activity.id).select_from(activity_orm.Activity).where(
+            *where(filters))
+        if search:
+            query = func.websearch_to_tsquery(literal_column(f"'{activity_orm.TEXT_SEARCH_CONFIG}'"), search)
+            rank = func.ts_rank(activity_orm.Activity.post_content_tsv, query)
+            statement = statement.add_columns(rank.label("rank")).where(
+                activity_orm.Activity.post_content_tsv.bool_op("@@")(query))
+            keyset.insert(0, rank)
+
+        if cursor is not None:
+            post_timestamp, activity_id, rank_position = decode_cursor(cursor)
+            position = (post_timestamp, activity_id)
+            if search:
+                if rank_position is None:
+                    raise ValueError("Invalid cursor")
+                position = (rank_position, *position)
+            statement = statement.where(tuple_(*keyset) < position)
+        elif offset:
+            statement = statement.offset(offset)
+        return statement.order_by(*(column.desc() for column in keyset)).limit(limit + 1)
+
+    @staticmethod
+    def _profiles_statement(limit: int = None, offset: int = None) -> Select:
+        """
+        Build the statement of `list_profiles`.
+        """
+        return select(
+            *(getattr(profile_orm.Profile, field) for field in Profile.model_fields)
+        ).order_by(profile_orm.Profile.profile_url).offset(offset).limit(limit)
+
+    async def commit(self) -> None:
+        """
+        Commit the pending changes of the current session.
+        """
+        await self.__session.commit()
 
     async def pre_action(self, *args, **kwargs):
         """
@@ -0,0 +1,64 @@
+"""
+This module contains the manager of the pool that runs the CPU-bound work off the event loop.
+"""
+import asyncio
+import functools
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Literal, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ExecutorManager:
+    """
+    Owns a pool of workers the CPU-bound computations (e.g. the analytics reports) are handed to,
+    so the event loop keeps serving the other requests meanwhile.
+
+    A `process` pool runs them in parallel, out of the GIL: the function and its arguments are pickled,
+    so the function MUST be defined at module level. A `thread` pool is cheaper, but only lets the event loop
+    run in between (the GIL is still shared), which is enough when the reports are small.
+
+    The pool MUST be opened from within a running event loop (e.g. the application lifespan)
+    and closed when the application shuts down.
+    """
+
+    def __init__(self, kind: Literal["process", "thread"] = "process", max_workers: int = 2):
+        if max_workers < 1:
+            raise ValueError("max_workers must be a positive integer")
+        self.kind = kind
+        self.max_workers = max_workers
+        self._executor: Executor | None = None
+
+    async def open(self) -> None:
+        if self._executor is not None:
+            return
+        if self.kind == "process":
+            # Workers are spawned rather than forked, so they do not inherit the event loop and the open connections.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="compute")
+
+    async def close(self) -> None:
+        if self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        # Waiting for the running computations blocks, hence in a thread.
+        await asyncio.to_thread(functools.partial(executor.shutdown, wait=True, cancel_futures=True))
+
+    @property
+    def is_open(self) -> bool:
+        return self._executor is not None
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Run `func(*args)` in the pool and wait for its result without blocking the event loop.
+        """
+        if not self.is_open:
+            raise Exception("ExecutorManager is not initialized")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
@@ -0,0 +1,72 @@
+"""
+This module contains the implementation of the in-process background job runner.
+"""
+import asyncio
+import datetime
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from src.domain.entity.job import SyncJob, SyncJobStatus
+from src.domain.runner.job import BaseJobRunner
+
+logger = logging.getLogger(__name__)
+
+
+class InProcessJobRunner(BaseJobRunner):
+    """
+    Runs the jobs as asyncio tasks of the current process.
+
+    At most `max_concurrent_jobs` jobs run at the same time, the rest wait in the `pending` status.
+    Only the latest `max_kept_jobs` finished jobs are kept for the status lookups.
+    """
+
+    def __init__(self, max_concurrent_jobs: int = 1, max_kept_jobs: int = 100):
+        if max_concurrent_jobs < 1:
+            raise ValueError("max_concurrent_jobs must be a positive integer")
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.max_kept_jobs = max_kept_jobs
+        self._semaphore = asyncio.Semaphore(max_concurrent_jobs)
+        self._jobs: OrderedDict[str, SyncJob] = OrderedDict()
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    async def submit(self, job: SyncJob, func: Callable[[SyncJob], Awaitable]) -> SyncJob:
+        self._jobs[job.id] = job
+        self._evict_finished()
+        task = asyncio.create_task(self._run(job, func))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+        return job
+
+    async def get(self, job_id: str) -> SyncJob | None:
+        return self._jobs.get(job_id)
+
+    async def close(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, job: SyncJob, func: Callable[[SyncJob], Awaitable]) -> None:
+        async with self._semaphore:
+            job.status = SyncJobStatus.RUNNING
+            job.started_at = datetime.datetime.utcnow()
+            try:
+                await func(job)
+                job.status = SyncJobStatus.SUCCEEDED
+            except asyncio.CancelledError:
+                job.status = SyncJobStatus.FAILED
+                job.error = "Cancelled"
+                raise
+            except Exception as exc:
+                logger.exception("Job %s failed.", job.id)
+                job.status = SyncJobStatus.FAILED
+                job.error = str(exc)
+            finally:
+                job.finished_at = datetime.datetime.utcnow()
+
+    def _evict_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items()
+                    if job.status in (SyncJobStatus.SUCCEEDED, SyncJobStatus.FAILED)]
+        for job_id in finished[:max(len(finished) - self.max_kept_jobs, 0)]:
+            del self._jobs[job_id]
@@ -1,15 +1,71 @@
+import csv
+import io
 import typing as t
+from contextlib import aclosing
+from enum import Enum
 from typing import Any
 
-from fastapi import APIRouter, Depends, Request
-from fastapi.responses import HTMLResponse
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from starlette.types import Send
 
 from src.application.usecase.activity import BaseActivityUseCase
-from src.domain.entity import ActivityFilter
+from src.domain.entity import Activity, ActivityFilter
 from src.presentation.base import BaseController
 from src.presentation.fastapi import templates
 
 
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+async def encode_ndjson(batches: t.AsyncIterator[list[Activity]]) -> t.AsyncIterator[str]:
+    async for activities in batches:
+        yield "".join(f"{activity.model_dump_json()}\n" for activity in activities)
+
+
+async def encode_csv(batches: t.AsyncIterator[list[Activity]]) -> t.AsyncIterator[str]:
+    columns = list(Activity.model_fields)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    async for activities in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([getattr(activity, column) for column in columns] for activity in activities)
+        yield buffer.getvalue()
+
+
+EXPORT_ENCODERS = {
+    ExportFormat.NDJSON: encode_ndjson,
+    ExportFormat.CSV: encode_csv,
+}
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    Streaming response that closes its body once sent, or as soon as the client disconnects mid-download
+    (the body is then suspended, and would otherwise hold its resources until garbage-collected).
+    The body is closed in the task that iterated it, shielded from the cancellation of the disconnect.
+    """
+
+    async def stream_response(self, send: Send) -> None:
+        try:
+            await super().stream_response(send)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await self.body_iterator.aclose()
+
+
 class ActivityController(BaseController):
     def __init__(
             self,
@@ -18,17 +74,59 @@ class ActivityController(BaseController):
         self.activity_usecase = activity_usecase
 
     def __list_activities(self) -> t.Callable[..., t.Any]:
-        async def endpoint(request: Request, filters: ActivityFilter = Depends(), offset: int = 0, limit: int = 1000) -> HTMLResponse:
-            activities = await self.activity_usecase.list(filters, limit=limit, offset=offset)
-            return templates.TemplateResponse("activity/index.html", {"activities": activities, "request": request})
+        async def endpoint(
+                request: Request,
+                filters: ActivityFilter = Depends(),
+                offset: int = Query(0, ge=0),
+                limit: int = Query(1000, ge=1),
+                cursor: str | None = None,
+                search: str | None = Query(None, max_length=256),
+        ) -> HTMLResponse:
+            try:
+                page = await self.activity_usecase.list(
+                    filters, limit=limit, offset=offset, cursor=cursor, search=search)
+            except ValueError as exc:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+            return templates.TemplateResponse(
+                "activity/index.html",
+                {"activities": page.items, "next_cursor": page.next_cursor, "search": search, "request": request}
+            )
+
+        return endpoint
+
+    def __export_activities(self) -> t.Callable[..., t.Any]:
+        async def endpoint(
+                filters: ActivityFilter = Depends(),
+                format: ExportFormat = ExportFormat.NDJSON,
+                batch_size: int = Query(5000, ge=1, le=100_000),
+        ) -> StreamingResponse:
+            async def body() -> t.AsyncIterator[str]:
+                # Closing the body closes the export, hence its session and server-side cursor.
+                async with aclosing(self.activity_usecase.export(filters, batch_size=batch_size)) as batches:
+                    async for chunk in EXPORT_ENCODERS[format](batches):
+                        yield chunk
+
+            return ClosingStreamingResponse(
+                body(),
+                media_type=EXPORT_MEDIA_TYPES[format],
+                headers={"Content-Disposition": f'attachment; filename="activities.{format.value}"'},
+            )
 
         return endpoint
 
     def __sync_activities(self) -> t.Callable[..., t.Any]:
-        async def endpoint() -> HTMLResponse:
-            activities = await self.activity_usecase.sync()
-            return HTMLResponse(content=
-                                f"""<html>{activities}</html> """)
+        async def endpoint() -> JSONResponse:
+            job = await self.activity_usecase.start_sync()
+            return JSONResponse(content=job.model_dump(mode="json"), status_code=status.HTTP_202_ACCEPTED)
+
+        return endpoint
+
+    def __get_sync_job(self) -> t.Callable[..., t.Any]:
+        async def endpoint(job_id: str) -> JSONResponse:
+            job = await self.activity_usecase.get_sync_job(job_id)
+            if job is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sync job not found")
+            return JSONResponse(content=job.model_dump(mode="json"))
 
         return endpoint
 
@@ -43,10 +141,23 @@ class ActivityController(BaseController):
             methods=["GET"],
             response_class=HTMLResponse,
         )
+        router.add_api_route(
+            path="/export",
+            endpoint=self.__export_activities(),
+            methods=["GET"],
+            response_class=StreamingResponse,
+        )
         router.add_api_route(
             path="/sync",
             endpoint=self.__sync_activities(),
             methods=["POST"],
-            response_class=HTMLResponse,
+            response_class=JSONResponse,
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+        router.add_api_route(
+            path="/sync/{job_id}",
+            endpoint=self.__get_sync_job(),
+            methods=["GET"],
+            response_class=JSONResponse,
         )
         return router
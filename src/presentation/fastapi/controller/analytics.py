@@ -1,5 +1,5 @@
 import typing as t
-from fastapi import APIRouter, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 
 from src.domain.entity.analytics.filter import AnalyticsReportFilter
 from src.presentation.base import BaseController
@@ -17,10 +17,15 @@ class AnalyticsController(BaseController):
                 profile_url: t.Annotated[
                     str,
                     Query(..., description="Profile URL")],
+                filters: AnalyticsReportFilter = Depends(),
         ) -> dict[str, str]:
-            report = await self.analytics_usecase.generate_report(
-                profile_url=profile_url,
-                filters=AnalyticsReportFilter())
+            try:
+                report = await self.analytics_usecase.generate_report(
+                    profile_url=profile_url,
+                    filters=filters)
+            except ValueError as exc:
+                # No activity of the profile matches the filters (e.g. a month without posts).
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
             return templates.TemplateResponse("analytics/index.html", {"request": request, "reports": [report]})
 
         return endpoint
@@ -12,7 +12,7 @@ class HomeController(BaseController):
 
     def __home(self) -> t.Callable[..., t.Any]:
         async def endpoint(request: Request) -> dict[str, str]:
-            profiles = await self.home_usecase.list_distinct_profiles()
+            profiles = await self.home_usecase.list_profiles()
             profiles = profiles * 100
             return templates.TemplateResponse("home/index.html", {"request": request, "profiles": profiles})
         return endpoint
@@ -0,0 +1,30 @@
+import typing as t
+from typing import Any
+
+from fastapi import APIRouter
+
+from src.application.usecase.monitoring import BaseMonitoringUseCase
+from src.presentation.base import BaseController
+
+
+class MonitoringController(BaseController):
+    def __init__(self, monitoring_usecase: BaseMonitoringUseCase):
+        self.monitoring_usecase = monitoring_usecase
+
+    def __db_pool_stats(self) -> t.Callable[..., t.Any]:
+        async def endpoint() -> dict[str, Any]:
+            return await self.monitoring_usecase.db_pool_stats()
+
+        return endpoint
+
+    def register(self) -> Any:
+        router = APIRouter(
+            prefix="/monitoring",
+            tags=["monitoring"],
+        )
+        router.add_api_route(
+            path="/db-pool",
+            endpoint=self.__db_pool_stats(),
+            methods=["GET"],
+        )
+        return router
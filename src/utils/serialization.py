@@ -0,0 +1,20 @@
+"""
+This module contains the JSON helpers for the application.
+`orjson` is used when it is installed (the `speedups` extra), the standard library otherwise.
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: str | bytes) -> Any:
+    """
+    Decode a JSON document with the fastest available backend.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
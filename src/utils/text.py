@@ -0,0 +1,63 @@
+"""
+This module contains the text metrics of the post contents, shared by the analytics computations.
+"""
+import re
+
+import emoji
+
+
+def _character_class(codepoints: set[int], gap: int = 1) -> str:
+    """
+    Regex character class of the code points, as ranges of the ones at most `gap` apart.
+    """
+    ranges: list[list[int]] = []
+    for codepoint in sorted(codepoints):
+        if ranges and codepoint <= ranges[-1][1] + gap:
+            ranges[-1][1] = codepoint
+        else:
+            ranges.append([codepoint, codepoint])
+    return "".join(
+        re.escape(chr(start)) if start == end else f"{re.escape(chr(start))}-{re.escape(chr(end))}"
+        for start, end in ranges
+    )
+
+
+def _emoji_run_pattern() -> re.Pattern:
+    """
+    Precompiled regex of the runs of characters emojis are made of (including the zero width joiner).
+
+    An emoji never spans a character outside of them, so counting the emojis of every run gives the count of
+    the whole text. The BMP characters are listed exactly; the astral ones are merged into a couple of wide
+    ranges: `re` matches the former with a bitmap and tests the latter one by one, so few ranges keep
+    scanning plain text fast, and a run that is too wide still gives the right count.
+    """
+    codepoints = {ord(char) for string in emoji.EMOJI_DATA for char in string} | {0x200D}
+    # ASCII characters (#, * and digits) are only part of the keycap emojis, i.e. followed by U+FE0F or U+20E3,
+    # so they only count as emoji characters there: hashtags and numbers do not make runs.
+    ascii_ = {codepoint for codepoint in codepoints if codepoint < 0x80}
+    bmp = {codepoint for codepoint in codepoints if 0x80 <= codepoint <= 0xFFFF}
+    astral = codepoints - ascii_ - bmp
+    keycap_base = f"[{_character_class(ascii_)}](?=[\ufe0f\u20e3])"
+    return re.compile(f"(?:{keycap_base}|[{_character_class(bmp)}{_character_class(astral, gap=0x400)}])+")
+
+
+EMOJI_RUN = _emoji_run_pattern()
+
+
+def count_emoji_run(run: str) -> int:
+    return emoji.emoji_count(run)
+
+
+def count_emojis(text: str | None) -> int:
+    """
+    Count the emojis as `emoji.emoji_count` does, tokenizing only the runs of emoji characters.
+    """
+    return sum(map(count_emoji_run, EMOJI_RUN.findall(text or "")))
+
+
+def count_paragraphs(text: str | None) -> int:
+    return (text or "").count("\n")
+
+
+def count_hashtags(text: str | None) -> int:
+    return (text or "").count("#")
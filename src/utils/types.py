@@ -4,7 +4,7 @@ This module contains the custom types for the application.
 import datetime
 from typing import Annotated, List, Type, TypeVar, Union
 
-from pydantic import BaseModel, BeforeValidator, RootModel
+from pydantic import AfterValidator, BaseModel, BeforeValidator, RootModel
 
 Number = Union[int, float]
 OpStr = Union[str, None]
@@ -40,6 +40,16 @@ CoercedDtOrDttm = Annotated[str | datetime.date | datetime.datetime, BeforeValid
 OpCoercedDtOrDttm = CoercedDtOrDttm | None
 
 
+def coerce_dttm_to_naive_utc(data: datetime.datetime | None) -> datetime.datetime | None:
+    if isinstance(data, datetime.datetime) and data.tzinfo is not None:
+        return data.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return data
+
+
+# The timestamps are stored without a time zone, in UTC.
+OpNaiveUtcDttm = Annotated[datetime.datetime | None, AfterValidator(coerce_dttm_to_naive_utc)]
+
+
 T = TypeVar("T", bound=BaseModel)
 
 